@@ -5,8 +5,9 @@ This module contains all API route handlers for the FAQ Finance Chatbot service.
 It defines the REST endpoints and their business logic.
 """
 
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from ..models.schemas import (
     ChatRequest, 
@@ -15,6 +16,7 @@ from ..models.schemas import (
     ServiceInfoResponse
 )
 from ..services.faq_service import faq_service, FAQServiceError
+from ..services.batching import batching_faq_service
 from ..core.logging import log_interaction, get_logger
 from ..core.config import settings
 
@@ -24,29 +26,49 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-async def get_faq_service():
+def _endpoint_error(error: Exception, log_message: str, status_code: int, detail: str) -> HTTPException:
     """
-    Dependency to get initialized FAQ service
+    Log an endpoint failure and build the HTTP error to raise
+    
+    Keeping the error path out of line keeps the endpoint bodies small.
+    
+    Args:
+        error (Exception): Exception raised while handling the request
+        log_message (str): Context for the error log entry
+        status_code (int): HTTP status code of the response
+        detail (str): Error detail returned to the client
+    
+    Returns:
+        HTTPException: Exception to raise from the endpoint
+    """
+    logger.error(f"{log_message}: {error}")
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+def get_faq_service():
+    """
+    Dependency to get the FAQ service
+    
+    The service is initialized by the application lifespan, which aborts
+    startup if initialization fails, so no per-request check is needed.
     
     Returns:
         FAQService: Initialized FAQ service instance
+    """
+    return faq_service
+
+
+def get_batching_service():
+    """
+    Dependency to get the batching wrapper around the initialized FAQ service
     
-    Raises:
-        HTTPException: If service initialization fails
+    Returns:
+        BatchingFAQService: Batching FAQ service instance
     """
-    try:
-        if not faq_service._initialized:
-            faq_service.initialize()
-        return faq_service
-    except FAQServiceError as e:
-        logger.error(f"FAQ service initialization failed: {e}")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Service initialization failed: {str(e)}"
-        )
+    return batching_faq_service
 
 
-@router.get("/", response_model=ServiceInfoResponse)
+@router.get("/", responses={200: {"model": ServiceInfoResponse}})
 async def get_service_info():
     """
     Get service information
@@ -54,36 +76,37 @@ async def get_service_info():
     Returns basic information about the FAQ Finance Chatbot service
     including available endpoints and current status.
     """
-    return ServiceInfoResponse(
-        service=settings.service_name,
-        status="running",
-        endpoints=["/chat", "/health"]
-    )
+    return ORJSONResponse({
+        "service": settings.service_name,
+        "status": "running",
+        "endpoints": ["/chat", "/health"]
+    })
 
 
-@router.post("/chat", response_model=ChatResponse)
+@router.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat(
     request: ChatRequest,
-    service = Depends(get_faq_service)
+    service = Depends(get_batching_service)
 ):
     """
     Process a chat message and return an answer
     
     This endpoint accepts a user question and returns the most appropriate
     answer from the FAQ knowledge base. If no suitable answer is found,
-    it returns a fallback response.
+    it returns a fallback response. Concurrent questions are batched and
+    matched together in a worker thread, keeping the event loop free.
     
     Args:
         request (ChatRequest): User's chat message
-        service: Injected FAQ service dependency
+        service: Injected batching FAQ service dependency
     
     Returns:
-        ChatResponse: Bot's response with answer and sources
+        ORJSONResponse: Bot's response with answer and sources (ChatResponse schema)
     
     Raises:
         HTTPException: If request processing fails
     """
-    query = request.message.strip()
+    query = request.message
     
     if not query:
         raise HTTPException(
@@ -93,7 +116,7 @@ async def chat(
     
     try:
         # Process the query using the FAQ service
-        result = service.process_query(query)
+        result = await service.aprocess_query(query)
         
         # Extract response data
         answer = result['answer']
@@ -103,27 +126,20 @@ async def chat(
         # Log the interaction
         log_interaction(query, answer, sources, similarity_score)
         
-        return ChatResponse(
-            answer=answer,
-            sources=sources
-        )
+        # Outputs are trusted: skip response model validation
+        return ORJSONResponse({
+            "answer": answer,
+            "sources": sources
+        })
         
     except FAQServiceError as e:
-        logger.error(f"FAQ service error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to process your question. Please try again."
-        )
+        raise _endpoint_error(e, "FAQ service error", 500, "Failed to process your question. Please try again.")
     except Exception as e:
-        logger.error(f"Unexpected error in chat endpoint: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="An unexpected error occurred. Please try again."
-        )
+        raise _endpoint_error(e, "Unexpected error in chat endpoint", 500, "An unexpected error occurred. Please try again.")
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check(service = Depends(get_faq_service)):
+@router.get("/health", responses={200: {"model": HealthResponse}})
+def health_check(service = Depends(get_faq_service)):
     """
     Health check endpoint
     
@@ -134,26 +150,22 @@ async def health_check(service = Depends(get_faq_service)):
         service: Injected FAQ service dependency
     
     Returns:
-        HealthResponse: Service health status and statistics
+        ORJSONResponse: Service health status and statistics (HealthResponse schema)
     """
     try:
         stats = service.get_service_stats()
         
-        return HealthResponse(
-            status="healthy",
-            faq_entries=stats.get('total_entries', 0)
-        )
+        return ORJSONResponse({
+            "status": "healthy",
+            "faq_entries": stats.get('total_entries', 0)
+        })
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail="Service unhealthy"
-        )
+        raise _endpoint_error(e, "Health check failed", 503, "Service unhealthy")
 
 
 @router.get("/stats")
-async def get_service_stats(service = Depends(get_faq_service)):
+def get_service_stats(service = Depends(get_faq_service)):
     """
     Get detailed service statistics
     
@@ -169,18 +181,14 @@ async def get_service_stats(service = Depends(get_faq_service)):
     """
     try:
         stats = service.get_service_stats()
-        return JSONResponse(content=stats)
+        return ORJSONResponse(content=stats)
         
     except Exception as e:
-        logger.error(f"Failed to get service stats: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to retrieve service statistics"
-        )
+        raise _endpoint_error(e, "Failed to get service stats", 500, "Failed to retrieve service statistics")
 
 
 @router.post("/search")
-async def search_faq(
+def search_faq(
     request: ChatRequest,
     service = Depends(get_faq_service)
 ):
@@ -197,7 +205,7 @@ async def search_faq(
     Returns:
         dict: Multiple matching FAQ entries with similarity scores
     """
-    query = request.message.strip()
+    query = request.message
     
     if not query:
         raise HTTPException(
@@ -208,29 +216,23 @@ async def search_faq(
     try:
         matches = service.get_multiple_matches(query, top_k=5)
         
-        return JSONResponse(content={
+        # Serialize straight to bytes, skipping response validation/encoding
+        payload = orjson.dumps({
             "query": query,
             "matches": [
                 {
-                    "id": match["id"],
-                    "question": match["q"],
-                    "answer": match["a"],
-                    "similarity_score": match.get("_similarity_score", 0.0)
+                    "id": entry["id"],
+                    "question": entry["q"],
+                    "answer": entry["a"],
+                    "similarity_score": score
                 }
-                for match in matches
+                for entry, score in matches
             ],
             "total_matches": len(matches)
         })
+        return Response(content=payload, media_type="application/json")
         
     except FAQServiceError as e:
-        logger.error(f"FAQ service error during search: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to search FAQ entries"
-        )
+        raise _endpoint_error(e, "FAQ service error during search", 500, "Failed to search FAQ entries")
     except Exception as e:
-        logger.error(f"Unexpected error in search endpoint: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="An unexpected error occurred during search"
-        )
\ No newline at end of file
+        raise _endpoint_error(e, "Unexpected error in search endpoint", 500, "An unexpected error occurred during search")
@@ -6,7 +6,7 @@ for the FAQ Finance Chatbot service.
 """
 
 import os
-from typing import List
+from typing import List, Literal
 from pydantic_settings import BaseSettings
 
 
@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     # Server configuration
     host: str = "0.0.0.0"
     port: int = 8001
+    workers: int = 1
+    server_loop: str = "auto"  # "auto" picks uvloop when installed
+    server_http: str = "auto"  # "auto" picks httptools when installed
     
     # CORS settings
     cors_origins: List[str] = ["http://localhost:3000"]
@@ -30,11 +33,24 @@ class Settings(BaseSettings):
     
     # FAQ matching configuration
     similarity_threshold: float = 0.3
+    vectorizer_analyzer: Literal["word", "char_wb"] = "word"  # char_wb: character 3-5-grams
     max_message_length: int = 1000
+    query_cache_size: int = 1024
+    dense_vectors_max_cells: int = 2 ** 20  # FAQ rows x used features kept dense
+    dense_vectors_max_rows: int = 4096  # Larger FAQs stay dense only above min density
+    dense_vectors_min_density: float = 0.05
+    dense_vectors_dtype: Literal["float32", "float16", "int8"] = "float32"
+    batch_max_size: int = 32  # Chat queries scored together in one matrix product
+    batch_max_wait_ms: float = 5.0  # Longest wait for busy workers; idle queries never wait
     
     # File paths
     data_dir: str = "data"
     faq_file: str = "faq.json"
+    faq_index_file: str = "faq_index.joblib"
+    # Fitted indexes are cached here by content hash; empty disables the cache
+    faq_index_cache_dir: str = os.path.join(os.path.expanduser("~"), ".cache", "chat-art")
+    faq_snapshot_enabled: bool = True  # Pickled snapshot of the parsed FAQ next to the JSON file
+    faq_stream_min_bytes: int = 8 * 2 ** 20  # Larger FAQ files are stream-decoded with ijson
     
     # Logging configuration
     log_level: str = "INFO"
@@ -45,6 +61,11 @@ class Settings(BaseSettings):
         """Get the full path to the FAQ file"""
         return os.path.join(self.data_dir, self.faq_file)
     
+    @property
+    def faq_index_file_path(self) -> str:
+        """Get the full path to the precomputed FAQ index file"""
+        return os.path.join(self.data_dir, self.faq_index_file)
+    
     class Config:
         env_prefix = "FAQ_"
         case_sensitive = False
@@ -5,23 +5,41 @@ This module contains logging configuration and utility functions
 for consistent logging throughout the application.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from datetime import datetime
-from typing import List
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
 
 from .config import settings
 
+# Background listener writing queued log records to stdout
+_queue_listener: Optional[QueueListener] = None
+
 
 def setup_logging() -> None:
     """
     Configure application logging with consistent format
+    
+    Records are pushed onto an in-memory queue and written to stdout by a
+    background thread, so request handlers never block on console I/O.
     """
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        return
+    
+    log_queue = queue.Queue(-1)
+    _queue_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    _queue_listener.start()
+    atexit.register(shutdown_logging)
+    
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
         format=settings.log_format,
         handlers=[
-            logging.StreamHandler(sys.stdout),
+            QueueHandler(log_queue),
         ]
     )
     
@@ -30,6 +48,17 @@ def setup_logging() -> None:
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """
+    Flush queued log records and stop the background listener
+    """
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the specified name
@@ -53,24 +82,13 @@ def log_interaction(question: str, answer: str, sources: List[str], similarity_s
         sources (List[str]): Source IDs used for the answer
         similarity_score (float, optional): Matching score for debugging
     """
-    timestamp = datetime.now().isoformat()
-    
-    # Console output for development
-    print(f"\n{'=' * 60}")
-    print(f"[{timestamp}]")
-    print(f"Question: {question}")
-    print(f"Answer: {answer}")
-    print(f"Sources: {', '.join(sources) if sources else 'None (fallback response)'}")
-    if similarity_score is not None:
-        print(f"Similarity Score: {similarity_score:.3f}")
-    print(f"{'=' * 60}\n")
-    
-    # Structured logging for production
     logger = get_logger("faq_chatbot.interaction")
     logger.info(
-        "Chat interaction",
+        "Chat interaction | question=%r | sources=%s | similarity_score=%s",
+        question,
+        ", ".join(sources) if sources else "None (fallback response)",
+        f"{similarity_score:.3f}" if similarity_score is not None else "n/a",
         extra={
-            "timestamp": timestamp,
             "question": question,
             "answer_length": len(answer),
             "sources": sources,
@@ -88,12 +106,11 @@ def log_matching_debug(query: str, similarity_score: float) -> None:
         query (str): User's query
         similarity_score (float): Best matching score
     """
-    timestamp = datetime.now().isoformat()
-    print(f"[{timestamp}] Query: '{query}' | Best match score: {similarity_score:.3f}")
-    
     logger = get_logger("faq_chatbot.matching")
     logger.debug(
-        "Question matching",
+        "Question matching | query=%r | best_score=%.3f",
+        query,
+        similarity_score,
         extra={
             "query": query,
             "similarity_score": similarity_score,
@@ -5,17 +5,17 @@ This module creates and configures the FastAPI application with all
 necessary middleware, routers, and startup/shutdown event handlers.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from .core.config import settings
 from .core.logging import setup_logging, get_logger
 from .api.endpoints import router
-from .services.faq_service import faq_service
+from .services.faq_service import faq_service, FAQServiceError
 from .services.knowledge_base import KnowledgeBaseError
-from .services.faq_service import FAQServiceError
 
 # Setup logging
 setup_logging()
@@ -29,13 +29,18 @@ async def lifespan(app: FastAPI):
     
     Handles startup and shutdown events for the FastAPI application.
     Initializes services during startup and performs cleanup during shutdown.
+    Startup fails if the services cannot be initialized, so request handlers
+    can rely on an initialized FAQ service. The knowledge base is loaded
+    asynchronously and vectorization runs in a worker thread, so neither
+    blocks the event loop.
     """
     # Startup
     logger.info(f"Starting {settings.service_name} v{settings.service_version}")
     
     try:
-        # Initialize FAQ service
-        faq_service.initialize()
+        # Load the knowledge base, then initialize the FAQ service on it
+        await faq_service.knowledge_base.aload_faq_data()
+        await asyncio.to_thread(faq_service.initialize)
         logger.info("FAQ service initialized successfully")
         
         # Log service configuration
@@ -45,9 +50,10 @@ async def lifespan(app: FastAPI):
         
     except (KnowledgeBaseError, FAQServiceError) as e:
         logger.error(f"Failed to initialize services: {e}")
-        # Don't exit completely, let health checks handle it
+        raise
     except Exception as e:
         logger.error(f"Unexpected error during startup: {e}")
+        raise
     
     yield
     
@@ -67,7 +73,8 @@ def create_app() -> FastAPI:
         description="A REST API service for answering finance-related questions using intelligent FAQ matching",
         version=settings.service_version,
         debug=settings.debug,
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS middleware
@@ -87,7 +94,7 @@ def create_app() -> FastAPI:
     async def global_exception_handler(request, exc):
         """Global exception handler for unhandled errors"""
         logger.error(f"Unhandled exception: {exc}", exc_info=True)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"detail": "Internal server error"}
         )
@@ -108,6 +115,9 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.host,
         port=settings.port,
+        workers=settings.workers,
+        loop=settings.server_loop,
+        http=settings.server_http,
         reload=settings.debug,
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
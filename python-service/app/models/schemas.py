@@ -5,7 +5,7 @@ This module contains all request and response models used for API validation
 and data serialization/deserialization.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List
 
 
@@ -18,6 +18,12 @@ class ChatRequest(BaseModel):
         description="User question to be processed by the chatbot"
     )
     
+    @field_validator("message")
+    @classmethod
+    def _strip(cls, value: str) -> str:
+        """Strip surrounding whitespace once, at validation time"""
+        return value.strip()
+    
     class Config:
         json_schema_extra = {
             "example": {
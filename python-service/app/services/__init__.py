@@ -7,5 +7,6 @@ knowledge base management, and core application services.
 
 from .faq_service import FAQService
 from .knowledge_base import KnowledgeBase
+from .batching import BatchingFAQService
 
-__all__ = ["FAQService", "KnowledgeBase"]
\ No newline at end of file
+__all__ = ["FAQService", "KnowledgeBase", "BatchingFAQService"]
\ No newline at end of file
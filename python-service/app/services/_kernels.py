@@ -0,0 +1,149 @@
+"""
+Compiled scoring kernels for FAQ Finance Chatbot
+
+This module contains the hot matching loops used by the FAQ service.
+They are compiled with Numba, or dispatched to SimSIMD's dot-product
+kernels, when those are installed; otherwise equivalent NumPy
+implementations are used.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+try:
+    import simsimd
+except ImportError:  # SimSIMD is optional
+    simsimd = None
+
+NUMBA_AVAILABLE = njit is not None
+SIMSIMD_AVAILABLE = simsimd is not None
+
+
+def _best_match_loop(faq: np.ndarray, query: np.ndarray) -> Tuple[int, float]:
+    """
+    Find the FAQ row with the highest dot product with the query
+
+    Args:
+        faq (np.ndarray): C-contiguous float32 matrix of L2-normalized FAQ vectors
+        query (np.ndarray): Contiguous float32 L2-normalized query vector
+
+    Returns:
+        Tuple[int, float]: Index and score of the best row (first one on ties)
+    """
+    # Seeded with row 0 rather than -inf: fastmath assumes no infinities
+    best_idx = 0
+    best_score = np.float32(0.0)
+    for i in range(faq.shape[0]):
+        score = np.float32(0.0)
+        for j in range(faq.shape[1]):
+            score += faq[i, j] * query[j]
+        if i == 0 or score > best_score:
+            best_idx = i
+            best_score = score
+    return best_idx, best_score
+
+
+def _best_match_numpy(faq: np.ndarray, query: np.ndarray) -> Tuple[int, float]:
+    """NumPy fallback for best_match when Numba is unavailable"""
+    scores = faq @ query
+    best_idx = int(np.argmax(scores))
+    return best_idx, float(scores[best_idx])
+
+
+def _top_k_loop(scores: np.ndarray, k: int, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k highest scores above a threshold in one pass
+    
+    Keeps a small buffer sorted by decreasing score, which for the few
+    matches requested is cheaper than a heap. Earlier entries win ties.
+    
+    Args:
+        scores (np.ndarray): Similarity score for each FAQ entry
+        k (int): Maximum number of entries to select
+        threshold (float): Scores must be strictly above this value
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Selected indices and their scores,
+                                       by decreasing score
+    """
+    top_indices = np.empty(max(k, 0), dtype=np.int64)
+    top_scores = np.empty(max(k, 0), dtype=scores.dtype)
+    count = 0
+    if k <= 0:
+        return top_indices, top_scores
+    
+    for i in range(scores.shape[0]):
+        score = scores[i]
+        if score <= threshold or (count == k and score <= top_scores[k - 1]):
+            continue
+        j = count if count < k else k - 1
+        while j > 0 and top_scores[j - 1] < score:
+            top_scores[j] = top_scores[j - 1]
+            top_indices[j] = top_indices[j - 1]
+            j -= 1
+        top_scores[j] = score
+        top_indices[j] = i
+        if count < k:
+            count += 1
+    return top_indices[:count], top_scores[:count]
+
+
+def _top_k_numpy(scores: np.ndarray, k: int, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy fallback for top_k when Numba is unavailable"""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), scores[:0]
+    candidates = np.argpartition(-scores, kth=k - 1)[:k]
+    top_indices = candidates[np.argsort(-scores[candidates], kind="stable")]
+    top_indices = top_indices[scores[top_indices] > threshold]
+    return top_indices, scores[top_indices]
+
+
+def dot_scores(queries: np.ndarray, faq: np.ndarray) -> np.ndarray:
+    """
+    Compute the dot products between queries and compact FAQ vectors
+    
+    Used for the float16 and int8 FAQ layouts, where NumPy has no fast
+    matrix product. SimSIMD computes them with mixed-precision SIMD
+    kernels; the NumPy fallback accumulates in float32 (int32 for int8).
+    
+    Args:
+        queries (np.ndarray): Query vectors, one row per query. int8
+                              queries must already be quantized.
+        faq (np.ndarray): C-contiguous float16 or int8 FAQ vectors
+    
+    Returns:
+        np.ndarray: float32 scores, one row per query and one column per FAQ entry
+    """
+    if SIMSIMD_AVAILABLE:
+        scores = simsimd.cdist(queries.astype(faq.dtype, copy=False), faq, metric="dot")
+        return np.asarray(scores, dtype=np.float32)
+    
+    accumulator = np.int32 if faq.dtype == np.int8 else np.float32
+    return np.einsum('qj,ij->qi', queries, faq, dtype=accumulator).astype(np.float32, copy=False)
+
+
+if NUMBA_AVAILABLE:
+    best_match = njit(cache=True, fastmath=True)(_best_match_loop)
+    top_k = njit(cache=True)(_top_k_loop)
+else:
+    best_match = _best_match_numpy
+    top_k = _top_k_numpy
+
+
+def warm_up() -> None:
+    """
+    Compile the kernels ahead of the first request
+
+    Calling this at startup moves the JIT compilation (or cache load)
+    out of the request path. It is a no-op without Numba.
+    """
+    if NUMBA_AVAILABLE:
+        best_match(np.zeros((1, 1), dtype=np.float32), np.zeros(1, dtype=np.float32))
+        top_k(np.zeros(8, dtype=np.float32), 3, 0.0)
@@ -0,0 +1,189 @@
+"""
+Dynamic query batching for FAQ Finance Chatbot
+
+This module groups chat queries that arrive within a short time window
+so they can be scored against the FAQ vectors in a single matrix product
+on a worker thread, instead of one matrix-vector product per request.
+"""
+
+import asyncio
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from .faq_service import FAQService, faq_service
+
+logger = get_logger(__name__)
+
+
+class _PendingBatch:
+    """Queries collected during one batching window"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items: List[Tuple[str, asyncio.Future]] = []
+
+
+class BatchingFAQService:
+    """
+    Asynchronous wrapper batching queries for an FAQService
+
+    Cached queries are answered straight from the FAQService query cache.
+    While no worker call is running, a query is processed right away with
+    the cached FAQService.process_query, so an idle service adds no delay.
+    Queries arriving while a worker call is busy are collected into a
+    batch, which runs as soon as the service is idle again, after at most
+    max_wait_ms, or once max_batch_size queries are waiting. The whole
+    batch is then processed by FAQService.process_queries in a worker
+    thread and each caller gets its own response.
+    """
+
+    def __init__(
+        self,
+        service: Optional[FAQService] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize the batching service
+
+        Args:
+            service (Optional[FAQService]): FAQ service processing the batches.
+                                          If None, uses global instance.
+            max_batch_size (Optional[int]): Maximum number of queries per batch.
+                                          If None, uses settings default.
+            max_wait_ms (Optional[float]): Maximum time a query waits for busy
+                                         worker calls before its batch runs,
+                                         in milliseconds.
+                                         If None, uses settings default.
+        """
+        self.service = service or faq_service
+        self.max_batch_size = max_batch_size or settings.batch_max_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.batch_max_wait_ms) / 1000
+        self._pending: Optional[_PendingBatch] = None
+        self._busy = 0  # Worker calls in flight
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def aprocess_query(self, query: str) -> Dict[str, Any]:
+        """
+        Process a user query, batching it with others while the service is busy
+
+        Args:
+            query (str): User's question
+
+        Returns:
+            Dict[str, Any]: Response containing answer, sources, and metadata
+
+        Raises:
+            FAQServiceError: If the query could not be processed
+        """
+        cached = self.service.get_cached_response(query)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        batch = self._pending
+        has_batch = batch is not None and batch.loop is loop
+
+        if self._busy == 0 and not has_batch:
+            return await self._run_single(query)
+
+        if not has_batch:
+            batch = _PendingBatch(loop)
+            self._pending = batch
+            # The deadline runs in its own task, so the batch is still
+            # processed if the request that opened it is cancelled
+            self._spawn(loop, self._flush_after(batch))
+
+        future = loop.create_future()
+        batch.items.append((query, future))
+
+        if len(batch.items) >= self.max_batch_size:
+            # Batch is full: close it now rather than waiting
+            self._pending = None
+            self._spawn(loop, self._run_batch(batch))
+
+        return await future
+
+    def _spawn(self, loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, None]) -> None:
+        """
+        Run a coroutine in a background task kept alive until it finishes
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop running the task
+            coro (Coroutine[Any, Any, None]): Coroutine to run
+        """
+        task = loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_single(self, query: str) -> Dict[str, Any]:
+        """
+        Process one query in a worker thread while the service is idle
+
+        Args:
+            query (str): User's question
+
+        Returns:
+            Dict[str, Any]: Response containing answer, sources, and metadata
+        """
+        self._busy += 1
+        try:
+            return await asyncio.to_thread(self.service.process_query, query)
+        finally:
+            self._worker_done()
+
+    def _worker_done(self) -> None:
+        """Record the end of a worker call and start the pending batch if now idle"""
+        self._busy -= 1
+        batch = self._pending
+        if self._busy == 0 and batch is not None and batch.loop is asyncio.get_running_loop():
+            self._pending = None
+            self._spawn(batch.loop, self._run_batch(batch))
+
+    async def _flush_after(self, batch: _PendingBatch) -> None:
+        """
+        Close and process a batch once it has waited max_wait_ms
+
+        Does nothing if the batch was already closed because it filled up
+        or because the service became idle.
+
+        Args:
+            batch (_PendingBatch): Pending batch
+        """
+        await asyncio.sleep(self.max_wait)
+        if self._pending is batch:
+            self._pending = None
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: _PendingBatch) -> None:
+        """
+        Process a closed batch in a worker thread and resolve its futures
+
+        Args:
+            batch (_PendingBatch): Batch to process
+        """
+        queries = [query for query, _ in batch.items]
+
+        self._busy += 1
+        try:
+            if len(queries) == 1:
+                results = [await asyncio.to_thread(self.service.process_query, queries[0])]
+            else:
+                results = await asyncio.to_thread(self.service.process_queries, queries)
+        except Exception as e:
+            logger.error(f"Failed to process batch of {len(queries)} queries: {e}")
+            for _, future in batch.items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._worker_done()
+
+        for (_, future), result in zip(batch.items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Global batching service instance
+batching_faq_service = BatchingFAQService()
@@ -5,17 +5,147 @@ This module contains the core business logic for matching user questions
 with FAQ entries using TF-IDF vectorization and cosine similarity.
 """
 
-from typing import Optional, Dict, Any, List
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Sequence, Tuple
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline, make_pipeline
+import joblib
 import numpy as np
+import orjson
 
 from ..core.config import settings
 from ..core.logging import get_logger, log_matching_debug
 from .knowledge_base import KnowledgeBase, knowledge_base
+from ._kernels import best_match, dot_scores, top_k as select_top_k, warm_up
 
 logger = get_logger(__name__)
 
+# Number of hashed TF-IDF features (hash buckets for unigrams and bigrams)
+HASHING_N_FEATURES = 2 ** 15
+
+# Largest int8 magnitude; each row's largest weight is quantized onto it
+INT8_SCALE = 127.0
+
+# Bumped whenever the vectorizer setup changes, invalidating saved indexes
+INDEX_FORMAT_VERSION = 3
+
+
+def _resolve_path(file_path: str) -> Path:
+    """Resolve a data file path relative to the project root"""
+    if os.path.isabs(file_path):
+        return Path(file_path)
+    return Path(__file__).parent.parent.parent / file_path
+
+
+def _quantize_rows(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize each row of a float32 matrix to int8 with its own scale
+    
+    A per-row scale keeps the full int8 range for rows whose weights are
+    all small, such as long questions, instead of one scale for every row.
+    
+    Args:
+        vectors (np.ndarray): Non-negative float32 matrix, one vector per row
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int8 matrix and the float32 scale of
+                                       each row (row ~= int8 row * scale)
+    """
+    row_max = vectors.max(axis=1)
+    scales = np.where(row_max > 0, row_max / np.float32(INT8_SCALE), np.float32(1.0))
+    scales = scales.astype(np.float32)
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _ResponseCache:
+    """
+    Thread-safe LRU cache of query responses
+    
+    Behaves like functools.lru_cache around a one-argument function, but
+    entries can also be probed with get() and filled with put(), so batch
+    processing can skip cached queries and cache the ones it computes.
+    """
+    
+    def __init__(self, func: Callable[[str], Dict[str, Any]], maxsize: int):
+        """
+        Initialize the cache
+        
+        Args:
+            func (Callable[[str], Dict[str, Any]]): Function computing a response
+            maxsize (int): Maximum number of cached responses (0 disables caching)
+        """
+        self._func = func
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def __call__(self, key: str) -> Dict[str, Any]:
+        """Return the cached response for a key, computing and caching it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = self._func(key)
+            self.put(key, value)
+        return value
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response without computing it
+        
+        Args:
+            key (str): Normalized query
+            
+        Returns:
+            Optional[Dict[str, Any]]: Cached response, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+    
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Cache a response, evicting the least recently used one if full
+        
+        Args:
+            key (str): Normalized query
+            value (Dict[str, Any]): Response to cache
+        """
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+    
+    def cache_info(self) -> CacheInfo:
+        """Report cache statistics, like functools.lru_cache"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+    
+    def cache_clear(self) -> None:
+        """Remove all cached responses and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
 
 class FAQServiceError(Exception):
     """Custom exception for FAQ service related errors"""
@@ -30,7 +160,12 @@ class FAQService:
     with the knowledge base using natural language processing techniques.
     """
 
-    def __init__(self, kb: Optional[KnowledgeBase] = None, threshold: Optional[float] = None):
+    def __init__(
+        self,
+        kb: Optional[KnowledgeBase] = None,
+        threshold: Optional[float] = None,
+        index_file_path: Optional[str] = None
+    ):
         """
         Initialize the FAQ service
         
@@ -39,12 +174,30 @@ class FAQService:
                                         If None, uses global instance.
             threshold (Optional[float]): Similarity threshold for matches.
                                        If None, uses settings default.
+            index_file_path (Optional[str]): Path to the precomputed FAQ index.
+                                           If None, uses settings default.
         """
         self.knowledge_base = kb or knowledge_base
         self.threshold = threshold or settings.similarity_threshold
+        self.index_file_path = index_file_path or settings.faq_index_file_path
         self._vectorizer = None
         self._faq_vectors = None
+        self._faq_dense = None
+        self._dense_row_scales = None
+        self._dense_column_map = None
+        self._ids = []
+        self._answers = []
         self._initialized = False
+        
+        # Per-instance LRU caches of processed queries and of query vectors,
+        # keyed on the normalized query. Responses can be probed without
+        # computing them, so batches only process cache misses.
+        self._cached_process_query = _ResponseCache(
+            self._process_normalized_query, settings.query_cache_size
+        )
+        self._cached_vectorize_query = functools.lru_cache(
+            maxsize=settings.query_cache_size
+        )(self._vectorize_query)
     
     def initialize(self) -> None:
         """
@@ -63,106 +216,571 @@ class FAQService:
             if not faq_questions:
                 raise FAQServiceError("No FAQ questions available for vectorization")
             
-            # Initialize TF-IDF vectorizer
-            self._vectorizer = TfidfVectorizer(
-                lowercase=True,
-                stop_words=None,  # Keep all words for better matching
-                ngram_range=(1, 2),  # Use unigrams and bigrams
-                max_features=5000  # Limit features for performance
-            )
+            # Reuse the precomputed index (see prepare_cache.py) or a cached
+            # index when one matches the current questions, otherwise fit the
+            # vectorizer from scratch and cache the result
+            cache_path = self._index_cache_path(faq_questions)
+            index = self._load_index(_resolve_path(self.index_file_path), faq_questions)
+            if index is None and cache_path is not None:
+                index = self._load_cached_index(cache_path, faq_questions)
+            
+            if index is not None:
+                self._vectorizer, self._faq_vectors = index
+            else:
+                self._vectorizer, self._faq_vectors = self._fit_vectors(faq_questions)
+                if cache_path is not None:
+                    self._cache_index(cache_path)
             
-            # Fit and transform FAQ questions
-            self._faq_vectors = self._vectorizer.fit_transform(faq_questions)
+            self._build_dense_vectors()
+            warm_up()
+            
+            # Row-aligned ids and answers for building responses by index
+            self._ids = self.knowledge_base.ids
+            self._answers = self.knowledge_base.answers
             self._initialized = True
+            self.clear_cache()
             
             logger.info(f"FAQ service initialized with {len(faq_questions)} questions")
-            logger.info(f"TF-IDF vocabulary size: {len(self._vectorizer.vocabulary_)}")
+            logger.info(f"TF-IDF vocabulary size: {self._get_vocab_size()}")
             
         except Exception as e:
             raise FAQServiceError(f"Failed to initialize FAQ service: {e}")
     
-    def find_best_match(self, query: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _make_vectorizer() -> Pipeline:
         """
-        Find the best matching FAQ entry for a user query
+        Build the unfitted hashed TF-IDF vectorizer for the configured analyzer
+        
+        Returns:
+            Pipeline: HashingVectorizer followed by a TfidfTransformer
+        """
+        if settings.vectorizer_analyzer == "char_wb":
+            # Character n-grams inside word boundaries, robust to
+            # abbreviations and typos
+            analyzer_params = {'analyzer': 'char_wb', 'ngram_range': (3, 5)}
+        else:
+            analyzer_params = {
+                'stop_words': None,  # Keep all words for better matching
+                'ngram_range': (1, 2)  # Use unigrams and bigrams
+            }
+        
+        # Hashed TF-IDF vectorizer: tokens are hashed straight to column
+        # indices, so no vocabulary dict is consulted per query.
+        # Inputs are lowercased by the caller, so the vectorizer skips it.
+        return make_pipeline(
+            HashingVectorizer(
+                lowercase=False,
+                n_features=HASHING_N_FEATURES,
+                alternate_sign=False,
+                norm=None,
+                dtype=np.float32,
+                **analyzer_params
+            ),
+            # Rows come out L2-normalized, for the FAQ questions and for every
+            # transformed query, so cosine similarity is a plain dot product
+            TfidfTransformer(norm='l2')
+        )
+    
+    def _fit_vectors(self, faq_questions: Sequence[str]) -> Tuple[Pipeline, csr_matrix]:
+        """
+        Fit the TF-IDF vectorizer and compute normalized FAQ vectors
         
         Args:
-            query (str): User's question
+            faq_questions (Sequence[str]): FAQ questions to vectorize
+            
+        Returns:
+            Tuple[Pipeline, csr_matrix]: Fitted vectorizer and L2-normalized FAQ vectors
+        """
+        vectorizer = self._make_vectorizer()
+        
+        # Fit and transform FAQ questions
+        normalized_questions = [question.lower().strip() for question in faq_questions]
+        faq_vectors = vectorizer.fit_transform(normalized_questions).tocsr()
+        
+        # Zero the IDF of hash buckets no FAQ question uses, so unseen query
+        # terms are dropped (as with a vocabulary) instead of skewing the norm.
+        # FAQ rows only use other buckets, so they stay normalized.
+        tfidf = vectorizer[-1]
+        tfidf.idf_ = np.where(faq_vectors.getnnz(axis=0) > 0, tfidf.idf_, 0.0)
+        
+        return vectorizer, faq_vectors
+    
+    @staticmethod
+    def _index_cache_path(faq_questions: Sequence[str]) -> Optional[Path]:
+        """
+        Get the path of the cached index for a set of FAQ questions
+        
+        The file name hashes the index format, the analyzer and the ordered
+        questions, so each distinct knowledge base gets its own entry.
+        
+        Args:
+            faq_questions (Sequence[str]): FAQ questions to vectorize
+            
+        Returns:
+            Optional[Path]: Path of the cached index, or None if caching is disabled
+        """
+        if not settings.faq_index_cache_dir:
+            return None
+        
+        key = hashlib.blake2b(
+            orjson.dumps([INDEX_FORMAT_VERSION, settings.vectorizer_analyzer, list(faq_questions)]),
+            digest_size=16
+        ).hexdigest()
+        return Path(settings.faq_index_cache_dir).expanduser() / f"faq_index-{key}.npz"
+    
+    def _load_index(
+        self,
+        index_path: Path,
+        faq_questions: Sequence[str]
+    ) -> Optional[Tuple[Pipeline, csr_matrix]]:
+        """
+        Load a saved FAQ index if it exists and is up to date
+        
+        The index is memory-mapped, so startup skips fitting the vectorizer.
+        It is only used if it was built from exactly the given questions
+        with the configured analyzer.
+        
+        Args:
+            index_path (Path): Path of the index file
+            faq_questions (Sequence[str]): Current FAQ questions
             
         Returns:
-            Optional[Dict[str, Any]]: Best matching FAQ entry if similarity
-                                    score exceeds threshold, None otherwise
+            Optional[Tuple[Pipeline, csr_matrix]]: Vectorizer and FAQ vectors,
+                                                   or None if unavailable or stale
+        """
+        if not index_path.exists():
+            return None
+        
+        try:
+            index = joblib.load(index_path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable FAQ index {index_path}: {e}")
+            return None
         
+        if (
+            index.get('format') != INDEX_FORMAT_VERSION
+            or index.get('analyzer') != settings.vectorizer_analyzer
+            or index.get('questions') != list(faq_questions)
+        ):
+            logger.info(f"Ignoring stale FAQ index {index_path}")
+            return None
+        
+        logger.info(f"Loaded precomputed FAQ index from {index_path}")
+        return index['vectorizer'], index['faq_vectors']
+    
+    def save_index(self) -> Path:
+        """
+        Save the fitted vectorizer and FAQ vectors as a precomputed index
+        
+        Returns:
+            Path: Path of the written index file
+            
         Raises:
-            FAQServiceError: If service is not initialized or query processing fails
+            FAQServiceError: If service is not initialized
         """
         if not self._initialized:
             raise FAQServiceError("FAQ service not initialized. Call initialize() first.")
         
-        if not query or not query.strip():
+        index_path = _resolve_path(self.index_file_path)
+        joblib.dump(
+            {
+                'format': INDEX_FORMAT_VERSION,
+                'analyzer': settings.vectorizer_analyzer,
+                'questions': list(self.knowledge_base.questions),
+                'vectorizer': self._vectorizer,
+                'faq_vectors': self._faq_vectors
+            },
+            index_path,
+            compress=0  # Uncompressed so arrays can be memory-mapped on load
+        )
+        logger.info(f"Saved FAQ index to {index_path}")
+        return index_path
+    
+    def _load_cached_index(
+        self,
+        cache_path: Path,
+        faq_questions: Sequence[str]
+    ) -> Optional[Tuple[Pipeline, csr_matrix]]:
+        """
+        Load a cached FAQ index if it exists and matches the given questions
+        
+        The cache only holds plain arrays, read without pickle: the IDF
+        weights are set on a freshly built vectorizer and the FAQ vectors
+        are rebuilt from their CSR arrays, so a cache file cannot run code
+        and does not depend on the installed scikit-learn version.
+        
+        Args:
+            cache_path (Path): Path of the cached index
+            faq_questions (Sequence[str]): Current FAQ questions
+            
+        Returns:
+            Optional[Tuple[Pipeline, csr_matrix]]: Vectorizer and FAQ vectors,
+                                                   or None if unavailable or stale
+        """
+        if not cache_path.exists():
+            return None
+        
+        try:
+            with np.load(cache_path, allow_pickle=False) as index:
+                if (
+                    int(index['format']) != INDEX_FORMAT_VERSION
+                    or str(index['analyzer']) != settings.vectorizer_analyzer
+                    or index['questions'].tolist() != list(faq_questions)
+                ):
+                    logger.info(f"Ignoring stale cached FAQ index {cache_path}")
+                    return None
+                
+                faq_vectors = csr_matrix(
+                    (index['data'], index['indices'], index['indptr']),
+                    shape=tuple(index['shape'])
+                )
+                idf = index['idf']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached FAQ index {cache_path}: {e}")
             return None
         
+        vectorizer = self._make_vectorizer()
+        vectorizer[-1].idf_ = idf
+        
+        logger.info(f"Loaded cached FAQ index from {cache_path}")
+        return vectorizer, faq_vectors
+    
+    def _cache_index(self, cache_path: Path) -> None:
+        """
+        Write the freshly fitted index to the index cache
+        
+        The file is written atomically, so concurrent processes never read a
+        partial index. Failures are logged and otherwise ignored: the cache
+        only speeds up the next start.
+        
+        Args:
+            cache_path (Path): Path of the cached index
+        """
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        faq_vectors = self._faq_vectors
+        
         try:
-            # Transform the query using the fitted vectorizer
-            query_vector = self._vectorizer.transform([query.strip()])
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write through a file object, np.savez would append ".npz" to the name
+            with open(temp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    format=INDEX_FORMAT_VERSION,
+                    analyzer=settings.vectorizer_analyzer,
+                    questions=np.array(list(self.knowledge_base.questions)),
+                    idf=self._vectorizer[-1].idf_,
+                    data=faq_vectors.data,
+                    indices=faq_vectors.indices,
+                    indptr=faq_vectors.indptr,
+                    shape=np.array(faq_vectors.shape)
+                )
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not cache FAQ index to {cache_path}: {e}")
+            temp_path.unlink(missing_ok=True)
+    
+    def _build_dense_vectors(self) -> None:
+        """
+        Build a dense copy of the FAQ vectors when it is small enough
+        
+        Only the feature columns used by at least one FAQ question are kept,
+        and a column map translates hashed feature indices to dense columns.
+        Small dense matrices let NumPy score queries with a BLAS matrix-vector
+        product instead of a sparse one. settings.dense_vectors_dtype can trade
+        precision for memory: "float16" halves the matrix size and "int8"
+        quantizes the weights with a scale per row, cutting memory traffic
+        by 4x at the cost of approximate scores (both are scored with
+        SimSIMD when installed).
+        """
+        used_columns = np.flatnonzero(self._faq_vectors.getnnz(axis=0))
+        
+        if not self._use_dense_vectors(used_columns.size):
+            self._faq_dense = None
+            self._dense_row_scales = None
+            self._dense_column_map = None
+            return
+        
+        column_map = np.full(self._faq_vectors.shape[1], -1, dtype=np.int32)
+        column_map[used_columns] = np.arange(used_columns.size, dtype=np.int32)
+        
+        faq_dense = np.ascontiguousarray(
+            self._faq_vectors[:, used_columns].toarray(), dtype=np.float32
+        )
+        row_scales = None
+        if settings.dense_vectors_dtype == "int8":
+            faq_dense, row_scales = _quantize_rows(faq_dense)
+        elif settings.dense_vectors_dtype == "float16":
+            faq_dense = faq_dense.astype(np.float16)
+        
+        self._dense_row_scales = row_scales
+        self._dense_column_map = column_map
+        self._faq_dense = faq_dense
+    
+    def _use_dense_vectors(self, used_column_count: int) -> bool:
+        """
+        Decide whether the FAQ vectors should be stored densely
+        
+        The dense matrix must fit in settings.dense_vectors_max_cells. Within
+        that budget it is used for knowledge bases with fewer than
+        settings.dense_vectors_max_rows entries, or whose compacted matrix is
+        at least settings.dense_vectors_min_density full; larger, sparser
+        matrices are cheaper to score in CSR form.
+        
+        Args:
+            used_column_count (int): Number of feature columns used by FAQ questions
             
-            # Calculate cosine similarity with all FAQ vectors
-            similarities = cosine_similarity(query_vector, self._faq_vectors)[0]
+        Returns:
+            bool: True if the dense matrix should be built
+        """
+        rows = self._faq_vectors.shape[0]
+        cells = rows * used_column_count
+        if cells == 0 or cells > settings.dense_vectors_max_cells:
+            return False
+        
+        density = self._faq_vectors.nnz / cells
+        return rows < settings.dense_vectors_max_rows or density >= settings.dense_vectors_min_density
+    
+    def _get_vocab_size(self) -> int:
+        """
+        Get the number of hashed features used by at least one FAQ question
+        
+        Returns:
+            int: Number of non-empty feature columns
+        """
+        if self._faq_vectors is None:
+            return 0
+        return int(np.count_nonzero(self._faq_vectors.getnnz(axis=0)))
+    
+    def _compute_similarities(self, query: str) -> np.ndarray:
+        """
+        Compute cosine similarities between a query and all FAQ questions
+        
+        Args:
+            query (str): Lowercased and stripped user question
             
-            # Find the best match
-            best_idx = np.argmax(similarities)
-            best_score = similarities[best_idx]
+        Returns:
+            np.ndarray: Similarity score for each FAQ entry
+        """
+        return self._score_vectors(self._cached_vectorize_query(query))[0]
+    
+    def _compute_similarity_matrix(self, queries: List[str]) -> np.ndarray:
+        """
+        Compute cosine similarities between queries and all FAQ questions
+        
+        FAQ and query vectors are L2-normalized by the vectorizer, so this
+        is a single matrix product, dense when the FAQ matrix is small and
+        sparse otherwise.
+        
+        Args:
+            queries (List[str]): Lowercased and stripped user questions
+            
+        Returns:
+            np.ndarray: Similarity scores, one row per query and one column per FAQ entry
+        """
+        return self._score_vectors(self._vectorize(queries))
+    
+    def _score_vectors(self, query_vectors: csr_matrix) -> np.ndarray:
+        """
+        Score normalized query vectors against all FAQ vectors
+        
+        Args:
+            query_vectors (csr_matrix): Normalized query vectors
+            
+        Returns:
+            np.ndarray: Similarity scores, one row per query and one column per FAQ entry
+        """
+        if self._faq_dense is not None:
+            dense_queries = self._densify(query_vectors)
+            
+            if self._faq_dense.dtype == np.int8:
+                quantized_queries, query_scales = _quantize_rows(dense_queries)
+                scores = dot_scores(quantized_queries, self._faq_dense)
+                return scores * query_scales[:, None] * self._dense_row_scales
+            
+            if self._faq_dense.dtype == np.float16:
+                # Accumulate in float32 without materializing a float32 copy
+                return dot_scores(dense_queries, self._faq_dense)
+            
+            return dense_queries @ self._faq_dense.T
+        
+        return (query_vectors @ self._faq_vectors.T).toarray()
+    
+    def _vectorize(self, queries: List[str]) -> csr_matrix:
+        """
+        Transform queries into L2-normalized TF-IDF vectors
+        
+        Args:
+            queries (List[str]): Lowercased and stripped user questions
+            
+        Returns:
+            csr_matrix: One sparse row per query
+        """
+        return self._vectorizer.transform(queries)
+    
+    def _vectorize_query(self, query: str) -> csr_matrix:
+        """
+        Transform a single query into its L2-normalized TF-IDF vector
+        
+        Wrapped in a per-instance LRU cache; the returned matrix is shared
+        and must not be mutated.
+        
+        Args:
+            query (str): Lowercased user question
+            
+        Returns:
+            csr_matrix: Sparse 1-row matrix
+        """
+        return self._vectorize([query])
+    
+    def _densify(self, query_vectors: csr_matrix) -> np.ndarray:
+        """
+        Scatter sparse query vectors into the dense FAQ column layout
+        
+        Features unused by the FAQ questions cannot contribute to the dot
+        product, so they are dropped.
+        
+        Args:
+            query_vectors (csr_matrix): Normalized query vectors
             
-            # Log matching details for debugging
-            log_matching_debug(query, best_score)
+        Returns:
+            np.ndarray: C-contiguous float32 matrix, one row per query
+        """
+        columns = self._dense_column_map[query_vectors.indices]
+        rows = np.repeat(np.arange(query_vectors.shape[0]), np.diff(query_vectors.indptr))
+        used = columns >= 0
+        dense_queries = np.zeros((query_vectors.shape[0], self._faq_dense.shape[1]), dtype=np.float32)
+        dense_queries[rows[used], columns[used]] = query_vectors.data[used]
+        return dense_queries
+    
+    def _find_best(self, query: str) -> Tuple[int, float]:
+        """
+        Find the index and score of the FAQ entry closest to a query
+        
+        Uses the compiled best_match kernel on the dense float32 matrix,
+        falling back to a full similarity computation otherwise.
+        
+        Args:
+            query (str): Lowercased and stripped user question
             
-            # Check if score exceeds threshold
-            if best_score > self.threshold:
-                best_entry = self.knowledge_base.get_entry_by_index(best_idx)
-                if best_entry:
-                    # Add similarity score to the result for debugging
-                    result = best_entry.copy()
-                    result['_similarity_score'] = float(best_score)
-                    return result
+        Returns:
+            Tuple[int, float]: Index and similarity score of the best entry
+        """
+        if self._faq_dense is not None and self._faq_dense.dtype == np.float32:
+            dense_query = self._densify(self._cached_vectorize_query(query))[0]
+            return best_match(self._faq_dense, dense_query)
+        
+        similarities = self._compute_similarities(query)
+        best_idx = int(np.argmax(similarities))
+        return best_idx, float(similarities[best_idx])
+    
+    def _accept_match(
+        self, query: str, best_idx: int, best_score: float
+    ) -> Optional[Tuple[str, str, float]]:
+        """
+        Apply the similarity threshold to the best FAQ entry
+        
+        Args:
+            query (str): User's question, for debug logging
+            best_idx (int): Index of the best FAQ entry
+            best_score (float): Similarity score of the best FAQ entry
             
+        Returns:
+            Optional[Tuple[str, str, float]]: ID, answer and score of the entry
+                                             if the score exceeds threshold,
+                                             None otherwise
+        """
+        # Log matching details for debugging
+        log_matching_debug(query, best_score)
+        
+        # Check if score exceeds threshold
+        if best_score > self.threshold:
+            return self._ids[best_idx], self._answers[best_idx], float(best_score)
+        
+        return None
+    
+    def find_best_match(self, query: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the best matching FAQ entry for a user query
+        
+        Surrounding whitespace is not stripped here; API requests are
+        stripped by ChatRequest validation.
+        
+        Args:
+            query (str): User's question
+            
+        Returns:
+            Optional[Tuple[str, str, float]]: ID, answer and similarity score
+                                             of the best matching FAQ entry if
+                                             the score exceeds threshold,
+                                             None otherwise
+        
+        Raises:
+            FAQServiceError: If service is not initialized or query processing fails
+        """
+        if not self._initialized:
+            raise FAQServiceError("FAQ service not initialized. Call initialize() first.")
+        
+        return self._match_normalized_query(query.lower())
+    
+    def _match_normalized_query(self, query: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the best matching FAQ entry for an already lowercased query
+        
+        Args:
+            query (str): Lowercased user question
+            
+        Returns:
+            Optional[Tuple[str, str, float]]: ID, answer and similarity score
+                                             of the best matching FAQ entry if
+                                             the score exceeds threshold,
+                                             None otherwise
+        
+        Raises:
+            FAQServiceError: If query processing fails
+        """
+        if not query:
             return None
+        
+        try:
+            best_idx, best_score = self._find_best(query)
+            return self._accept_match(query, best_idx, best_score)
             
         except Exception as e:
             logger.error(f"Error during question matching: {e}")
             raise FAQServiceError(f"Failed to process query: {e}")
     
-    def get_multiple_matches(self, query: str, top_k: int = 3) -> List[Dict[str, Any]]:
+    def get_multiple_matches(self, query: str, top_k: int = 3) -> List[Tuple[Dict[str, Any], float]]:
         """
         Get multiple matching FAQ entries for a query
         
+        Entries are returned by reference from the knowledge base and
+        must not be mutated.
+        
         Args:
             query (str): User's question
             top_k (int): Number of top matches to return
             
         Returns:
-            list[Dict[str, Any]]: List of top matching FAQ entries with scores
+            List[Tuple[Dict[str, Any], float]]: Top matching FAQ entries with scores
         """
         if not self._initialized:
             raise FAQServiceError("FAQ service not initialized. Call initialize() first.")
         
-        if not query or not query.strip():
+        query = query.lower()
+        if not query:
             return []
         
         try:
-            query_vector = self._vectorizer.transform([query.strip()])
-            similarities = cosine_similarity(query_vector, self._faq_vectors)[0]
+            similarities = self._compute_similarities(query)
             
-            # Get top k indices
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+            # Top k entries above the threshold, by decreasing score
+            top_indices, top_scores = select_top_k(similarities, int(top_k), float(self.threshold))
             
             results = []
-            for idx in top_indices:
-                score = similarities[idx]
-                if score > self.threshold:
-                    entry = self.knowledge_base.get_entry_by_index(int(idx))
-                    if entry:
-                        result = entry.copy()
-                        result['_similarity_score'] = float(score)
-                        results.append(result)
+            for idx, score in zip(top_indices, top_scores):
+                entry = self.knowledge_base.get_entry_by_index(int(idx))
+                if entry:
+                    results.append((entry, float(score)))
             
             return results
             
@@ -188,20 +806,118 @@ class FAQService:
         """
         Process a user query and return a complete response
         
+        Results are cached on the lowercased, stripped query, so repeated
+        questions skip vectorization and matching entirely. The returned
+        dictionary is shared between callers and must not be mutated.
+        
         Args:
             query (str): User's question
             
         Returns:
             Dict[str, Any]: Response containing answer, sources, and metadata
         """
-        # Find best match
-        match = self.find_best_match(query)
+        if not self._initialized:
+            raise FAQServiceError("FAQ service not initialized. Call initialize() first.")
         
+        return self._cached_process_query(query.lower().strip())
+    
+    def get_cached_response(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response for a query without processing it
+        
+        Args:
+            query (str): User's question
+            
+        Returns:
+            Optional[Dict[str, Any]]: Shared cached response, or None if the
+                                    query is not cached or the service is not
+                                    initialized
+        """
+        if not self._initialized:
+            return None
+        
+        return self._cached_process_query.get(query.lower().strip())
+    
+    def _process_normalized_query(self, query: str) -> Dict[str, Any]:
+        """
+        Build the response for an already normalized query (uncached)
+        
+        Args:
+            query (str): Lowercased and stripped user question
+            
+        Returns:
+            Dict[str, Any]: Response containing answer, sources, and metadata
+        """
+        return self._build_response(self._match_normalized_query(query))
+    
+    def process_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of user queries with a single similarity computation
+        
+        All queries are vectorized together and scored against the FAQ
+        vectors in one matrix product, and the best entry of every query
+        is found in one row-wise reduction, amortizing per-call overhead.
+        Cached queries are answered from the query cache and only the
+        distinct misses are scored; their responses are cached in turn.
+        
+        Args:
+            queries (List[str]): User questions
+            
+        Returns:
+            List[Dict[str, Any]]: One response per query, in the same order
+        
+        Raises:
+            FAQServiceError: If service is not initialized or query processing fails
+        """
+        if not self._initialized:
+            raise FAQServiceError("FAQ service not initialized. Call initialize() first.")
+        
+        if not queries:
+            return []
+        
+        normalized_queries = [query.lower().strip() for query in queries]
+        cache = self._cached_process_query
+        responses = {}
+        for query in normalized_queries:
+            if query not in responses:
+                responses[query] = cache.get(query)
+        missed_queries = [query for query, response in responses.items() if response is None]
+        
+        try:
+            if missed_queries:
+                similarity_matrix = self._compute_similarity_matrix(missed_queries)
+                best_indices = similarity_matrix.argmax(axis=1)
+                best_scores = np.take_along_axis(similarity_matrix, best_indices[:, None], axis=1)[:, 0]
+                for query, best_idx, best_score in zip(
+                    missed_queries, best_indices.tolist(), best_scores.tolist()
+                ):
+                    response = self._build_response(self._accept_match(query, best_idx, best_score))
+                    cache.put(query, response)
+                    responses[query] = response
+            
+            return [responses[query] for query in normalized_queries]
+            
+        except Exception as e:
+            logger.error(f"Error during batch question matching: {e}")
+            raise FAQServiceError(f"Failed to process queries: {e}")
+    
+    def _build_response(self, match: Optional[Tuple[str, str, float]]) -> Dict[str, Any]:
+        """
+        Build a query response from a matched FAQ entry
+        
+        Args:
+            match (Optional[Tuple[str, str, float]]): ID, answer and score of
+                                                     the matched entry, or None
+            
+        Returns:
+            Dict[str, Any]: Response containing answer, sources, and metadata
+        """
         if match:
+            entry_id, answer, score = match
             return {
-                'answer': match['a'],
-                'sources': [match['id']],
-                'similarity_score': match.get('_similarity_score'),
+                'answer': answer,
+                'sources': [entry_id],
+                'similarity_score': score,
                 'matched': True
             }
         else:
@@ -222,7 +938,7 @@ class FAQService:
         stats = {
             'initialized': self._initialized,
             'threshold': self.threshold,
-            'vectorizer_vocab_size': len(self._vectorizer.vocabulary_) if self._vectorizer else 0,
+            'vectorizer_vocab_size': self._get_vocab_size(),
             'faq_vectors_shape': self._faq_vectors.shape if self._faq_vectors is not None else None
         }
         
@@ -242,7 +958,18 @@ class FAQService:
             raise ValueError("Threshold must be between 0.0 and 1.0")
         
         self.threshold = new_threshold
+        self.clear_cache()
         logger.info(f"Updated similarity threshold to {new_threshold}")
+    
+    def clear_cache(self) -> None:
+        """
+        Clear the processed query and query vector caches
+        
+        Must be called whenever matching results may change, e.g. after
+        a threshold update or a knowledge base reload.
+        """
+        self._cached_process_query.cache_clear()
+        self._cached_vectorize_query.cache_clear()
 
 
 # Global FAQ service instance
@@ -6,16 +6,57 @@ It provides a clean interface for accessing FAQ entries and handles
 file loading with proper error handling.
 """
 
-import json
+import asyncio
 import os
+import pickle
+import re
+import sys
+from itertools import chain, compress
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import orjson
+
+try:
+    import ijson
+except ImportError:  # ijson is optional
+    ijson = None
+
+try:
+    import aiofiles
+    import aiofiles.os
+except ImportError:  # aiofiles is optional
+    aiofiles = None
+
 from ..core.config import settings
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Bump whenever the attributes stored in the snapshot change
+SNAPSHOT_FORMAT_VERSION = 3
+
+# Loaded state restored from a snapshot instead of parsing the JSON file
+_SNAPSHOT_ATTRS = (
+    "_faq_data", "_ids", "_questions", "_answers",
+    "_id_index", "_questions_lower", "_word_index", "_stats",
+)
+
+# Every key a snapshot must hold before it is trusted
+_SNAPSHOT_KEYS = frozenset(("format", "mtime_ns", "size") + _SNAPSHOT_ATTRS)
+
+# Public attributes set on load, mapped to their internal storage;
+# accessing one before loading triggers the load (see __getattr__)
+_LAZY_ATTRIBUTES = {
+    "faq_data": "_faq_data",
+    "questions": "_questions",
+    "ids": "_ids",
+    "answers": "_answers",
+}
+
+# Word tokens indexed by the search_questions inverted index
+_WORD_PATTERN = re.compile(r"\w+")
+
 
 class KnowledgeBaseError(Exception):
     """Custom exception for knowledge base related errors"""
@@ -28,8 +69,21 @@ class KnowledgeBase:
 
     This class handles loading, caching, and providing access to the FAQ
     knowledge base. It ensures the data is properly loaded and validated.
+    
+    Attributes (loaded on first access, shared and not to be mutated):
+        faq_data (List[Dict[str, Any]]): List of FAQ entries
+        questions (Tuple[str, ...]): FAQ questions
+        ids (List[str]): Entry IDs, aligned with the FAQ entry indices
+        answers (List[str]): Answers, aligned with the FAQ entry indices
     """
 
+    __slots__ = (
+        "faq_file_path", "_resolved_path", "_loaded",
+        "_faq_data", "_ids", "_questions", "_answers",
+        "_id_index", "_questions_lower", "_word_index", "_stats",
+        *_LAZY_ATTRIBUTES,
+    )
+
     def __init__(self, faq_file_path: Optional[str] = None):
         """
         Initialize the knowledge base
@@ -39,9 +93,54 @@ class KnowledgeBase:
                                          If None, uses settings default.
         """
         self.faq_file_path = faq_file_path or settings.faq_file_path
+        
+        # Handle both absolute and relative paths, resolved once
+        if os.path.isabs(self.faq_file_path):
+            self._resolved_path = Path(self.faq_file_path)
+        else:
+            # Relative paths are relative to the project root
+            project_root = Path(__file__).parent.parent.parent
+            self._resolved_path = (project_root / self.faq_file_path).resolve()
+        
         self._faq_data = []
+        self._ids = []
+        self._answers = []
+        self._id_index = {}
+        self._questions = ()
+        self._questions_lower = []
+        self._word_index = {}
+        self._stats = {}
         self._loaded = False
         
+    @classmethod
+    def from_data(
+        cls, data: List[Dict[str, Any]], faq_file_path: Optional[str] = None
+    ) -> "KnowledgeBase":
+        """
+        Create a loaded knowledge base from already decoded FAQ entries
+        
+        The entries are validated and indexed as if they had been read from
+        a file, but nothing is read from or written to disk. reload() still
+        reads faq_file_path.
+        
+        Args:
+            data (List[Dict[str, Any]]): FAQ entries
+            faq_file_path (Optional[str]): Path to FAQ JSON file used by reload().
+                                         If None, uses settings default.
+            
+        Returns:
+            KnowledgeBase: Loaded knowledge base
+            
+        Raises:
+            KnowledgeBaseError: If data is invalid
+        """
+        kb = cls(faq_file_path)
+        kb._faq_data = data
+        kb._validate_faq_data()
+        kb._build_indexes()
+        kb._mark_loaded()
+        return kb
+    
     def load_faq_data(self) -> None:
         """
         Load FAQ data from JSON file
@@ -49,35 +148,243 @@ class KnowledgeBase:
         Raises:
             KnowledgeBaseError: If file cannot be loaded or data is invalid
         """
+        file_path = self._resolved_path
+        
         try:
-            # Handle both absolute and relative paths
-            if not os.path.isabs(self.faq_file_path):
-                # Convert to absolute path relative to project root
-                project_root = Path(__file__).parent.parent.parent
-                file_path = project_root / self.faq_file_path
+            source_stat = file_path.stat()
+            
+            if self._restore_snapshot(file_path, source_stat):
+                return
+            
+            if self._should_stream(source_stat):
+                self._load_streamed(file_path, source_stat)
             else:
-                file_path = Path(self.faq_file_path)
+                self._load_from_bytes(file_path, source_stat, file_path.read_bytes())
+            
+        except Exception as e:
+            raise self._load_error(e, file_path)
+    
+    async def aload_faq_data(self) -> None:
+        """
+        Load FAQ data from JSON file without blocking the event loop
+        
+        The file is read with aiofiles when it is installed; parsing,
+        validation and indexing run in a worker thread.
+        
+        Raises:
+            KnowledgeBaseError: If file cannot be loaded or data is invalid
+        """
+        if aiofiles is None:
+            await asyncio.to_thread(self.load_faq_data)
+            return
+        
+        file_path = self._resolved_path
+        
+        try:
+            source_stat = await aiofiles.os.stat(file_path)
             
-            if not file_path.exists():
-                raise KnowledgeBaseError(f"FAQ file not found: {file_path}")
+            if await asyncio.to_thread(self._restore_snapshot, file_path, source_stat):
+                return
             
-            with open(file_path, "r", encoding="utf-8") as f:
-                self._faq_data = json.load(f)
+            if self._should_stream(source_stat):
+                await asyncio.to_thread(self._load_streamed, file_path, source_stat)
+                return
             
-            # Validate the loaded data
-            self._validate_faq_data()
-            self._loaded = True
+            async with aiofiles.open(file_path, "rb") as f:
+                data = await f.read()
+            await asyncio.to_thread(self._load_from_bytes, file_path, source_stat, data)
             
-            logger.info(f"Loaded {len(self._faq_data)} FAQ entries from {file_path}")
+        except Exception as e:
+            raise self._load_error(e, file_path)
+    
+    @staticmethod
+    def _should_stream(source_stat: os.stat_result) -> bool:
+        """Check whether an FAQ file is large enough to be stream-decoded"""
+        return ijson is not None and source_stat.st_size >= settings.faq_stream_min_bytes
+    
+    def _restore_snapshot(self, file_path: Path, source_stat: os.stat_result) -> bool:
+        """
+        Mark the knowledge base loaded from a fresh snapshot, if there is one
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Current stat of the FAQ JSON file
+            
+        Returns:
+            bool: True if the snapshot was loaded, False otherwise
+        """
+        if not self._load_snapshot(file_path, source_stat):
+            return False
+        
+        self._mark_loaded()
+        logger.info(f"Loaded {len(self._faq_data)} FAQ entries from snapshot of {file_path}")
+        return True
+    
+    def _load_from_bytes(self, file_path: Path, source_stat: os.stat_result, data: bytes) -> None:
+        """
+        Parse, validate and index the contents of an FAQ file
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Stat of the FAQ JSON file that was read
+            data (bytes): Contents of the FAQ JSON file
+        """
+        self._faq_data = orjson.loads(data)
+        
+        # Validate the loaded data
+        self._validate_faq_data()
+        
+        self._finish_load(file_path, source_stat)
+    
+    def _load_streamed(self, file_path: Path, source_stat: os.stat_result) -> None:
+        """
+        Stream-decode, validate and index a large FAQ file
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Stat of the FAQ JSON file
+        """
+        self._faq_data = self._stream_faq_data(file_path)
+        # Entries were already validated while they were decoded
+        self._finish_load(file_path, source_stat, validate_entries=False)
+    
+    def _finish_load(
+        self,
+        file_path: Path,
+        source_stat: os.stat_result,
+        validate_entries: bool = True
+    ) -> None:
+        """
+        Build the indexes for decoded FAQ data and write its snapshot
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Stat of the FAQ JSON file that was read
+            validate_entries (bool): Whether to validate entries while indexing
+        """
+        self._build_indexes(validate_entries)
+        self._mark_loaded()
+        
+        logger.info(f"Loaded {len(self._faq_data)} FAQ entries from {file_path}")
+        
+        self._save_snapshot(file_path, source_stat)
+    
+    @staticmethod
+    def _load_error(error: Exception, file_path: Path) -> KnowledgeBaseError:
+        """
+        Convert an exception raised while loading into a KnowledgeBaseError
+        
+        Args:
+            error (Exception): Exception raised while loading
+            file_path (Path): Path to the FAQ JSON file
+            
+        Returns:
+            KnowledgeBaseError: Exception to raise
+        """
+        if isinstance(error, FileNotFoundError):
+            return KnowledgeBaseError(f"FAQ file not found: {file_path}")
+        if isinstance(error, orjson.JSONDecodeError) or (
+            ijson is not None and isinstance(error, ijson.JSONError)
+        ):
+            return KnowledgeBaseError(f"Invalid JSON in FAQ file: {error}")
+        return KnowledgeBaseError(f"Failed to load FAQ data: {error}")
+    
+    @staticmethod
+    def _snapshot_path(file_path: Path) -> Path:
+        """Get the path of the pickled snapshot stored next to an FAQ file"""
+        return file_path.with_suffix(".pkl")
+    
+    def _load_snapshot(self, file_path: Path, source_stat: os.stat_result) -> bool:
+        """
+        Restore the parsed and validated FAQ data from its snapshot
+        
+        The snapshot is only used when it was written for the current
+        modification time and size of the FAQ file.
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Current stat of the FAQ JSON file
             
-        except json.JSONDecodeError as e:
-            raise KnowledgeBaseError(f"Invalid JSON in FAQ file: {e}")
+        Returns:
+            bool: True if the snapshot was loaded, False otherwise
+        """
+        if not settings.faq_snapshot_enabled:
+            return False
+        
+        snapshot_path = self._snapshot_path(file_path)
+        
+        try:
+            with open(snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable FAQ snapshot {snapshot_path}: {e}")
+            return False
+        
+        if not isinstance(snapshot, dict) or not _SNAPSHOT_KEYS.issubset(snapshot):
+            logger.warning(f"Ignoring malformed FAQ snapshot {snapshot_path}")
+            return False
+        
+        if (
+            snapshot.get("format") != SNAPSHOT_FORMAT_VERSION
+            or snapshot.get("mtime_ns") != source_stat.st_mtime_ns
+            or snapshot.get("size") != source_stat.st_size
+        ):
+            logger.info(f"FAQ snapshot {snapshot_path} is stale, parsing {file_path}")
+            return False
+        
+        for attr in _SNAPSHOT_ATTRS:
+            setattr(self, attr, snapshot[attr])
+        
+        # Pickle keeps the IDs shared but not interned
+        for entry in self._faq_data:
+            entry["id"] = sys.intern(entry["id"])
+        self._ids = [entry["id"] for entry in self._faq_data]
+        self._id_index = {sys.intern(entry_id): entry for entry_id, entry in self._id_index.items()}
+        return True
+    
+    def _save_snapshot(self, file_path: Path, source_stat: os.stat_result) -> None:
+        """
+        Write the parsed and validated FAQ data to its snapshot
+        
+        Failures are logged and otherwise ignored, so a read-only data
+        directory only costs the parsing on the next start.
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
+            source_stat (os.stat_result): Stat of the FAQ JSON file that was parsed
+        """
+        if not settings.faq_snapshot_enabled:
+            return
+        
+        snapshot_path = self._snapshot_path(file_path)
+        snapshot = {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "mtime_ns": source_stat.st_mtime_ns,
+            "size": source_stat.st_size,
+        }
+        for attr in _SNAPSHOT_ATTRS:
+            snapshot[attr] = getattr(self, attr)
+        
+        temp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
         except Exception as e:
-            raise KnowledgeBaseError(f"Failed to load FAQ data: {e}")
+            logger.warning(f"Could not write FAQ snapshot {snapshot_path}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
     
     def _validate_faq_data(self) -> None:
         """
-        Validate the structure of loaded FAQ data
+        Validate the top-level structure of loaded FAQ data
+        
+        Entries themselves are validated by _build_indexes, in the same
+        pass that indexes them.
         
         Raises:
             KnowledgeBaseError: If data structure is invalid
@@ -87,53 +394,159 @@ class KnowledgeBase:
         
         if not self._faq_data:
             raise KnowledgeBaseError("FAQ data cannot be empty")
+    
+    @staticmethod
+    def _validate_entry(i: int, entry: Any) -> None:
+        """
+        Validate the structure of a single FAQ entry
         
-        required_fields = {"id", "q", "a"}
-        
-        for i, entry in enumerate(self._faq_data):
-            if not isinstance(entry, dict):
-                raise KnowledgeBaseError(f"FAQ entry {i} must be a dictionary")
+        Args:
+            i (int): Index of the entry, for error messages
+            entry (Any): Decoded FAQ entry
             
-            missing_fields = required_fields - set(entry.keys())
-            if missing_fields:
-                raise KnowledgeBaseError(
-                    f"FAQ entry {i} missing required fields: {missing_fields}"
-                )
+        Raises:
+            KnowledgeBaseError: If the entry is invalid
+        """
+        if not isinstance(entry, dict):
+            raise KnowledgeBaseError(f"FAQ entry {i} must be a dictionary")
+        
+        try:
+            entry_id, question, answer = entry["id"], entry["q"], entry["a"]
+        except KeyError:
+            # Only build the sets on the error path
+            missing_fields = {"id", "q", "a"} - set(entry.keys())
+            raise KnowledgeBaseError(
+                f"FAQ entry {i} missing required fields: {missing_fields}"
+            )
+        
+        # Validate field types and content
+        if not isinstance(entry_id, str) or not entry_id.strip():
+            raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'id' field")
+        
+        if not isinstance(question, str) or not question.strip():
+            raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'q' field")
+        
+        if not isinstance(answer, str) or not answer.strip():
+            raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'a' field")
+    
+    def _stream_faq_data(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        Decode and validate FAQ entries incrementally with ijson
+        
+        Avoids holding the raw file contents in memory next to the decoded
+        entries. Only entries of a top-level array are read.
+        
+        Args:
+            file_path (Path): Path to the FAQ JSON file
             
-            # Validate field types and content
-            if not isinstance(entry["id"], str) or not entry["id"].strip():
-                raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'id' field")
+        Returns:
+            List[Dict[str, Any]]: Validated FAQ entries
             
-            if not isinstance(entry["q"], str) or not entry["q"].strip():
-                raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'q' field")
+        Raises:
+            KnowledgeBaseError: If the data is not a list, an entry is invalid
+                or no entries were found
+        """
+        faq_data = []
+        
+        with open(file_path, "rb") as f:
+            events = ijson.parse(f, use_float=True)
+            first_event = next(events, None)
+            if first_event is None or first_event[:2] != ("", "start_array"):
+                raise KnowledgeBaseError("FAQ data must be a list of entries")
             
-            if not isinstance(entry["a"], str) or not entry["a"].strip():
-                raise KnowledgeBaseError(f"FAQ entry {i} has invalid 'a' field")
+            # Put the peeked event back so items() sees the whole array
+            for i, entry in enumerate(ijson.items(chain((first_event,), events), "item")):
+                self._validate_entry(i, entry)
+                faq_data.append(entry)
+        
+        if not faq_data:
+            raise KnowledgeBaseError("FAQ data cannot be empty")
+        
+        return faq_data
     
-    @property
-    def faq_data(self) -> List[Dict[str, Any]]:
+    def _build_indexes(self, validate_entries: bool = True) -> None:
         """
-        Get the FAQ data, loading it if necessary
+        Validate entries and build lookup structures and statistics in a
+        single pass over the data
         
-        Returns:
-            List[Dict[str, Any]]: List of FAQ entries
+        Per-field lists are aligned with the entry indices. In the ID index,
+        the first entry wins on duplicate IDs. A plain dict is used on
+        purpose: string keys cache their hash, so a lookup is one probe and
+        one comparison in the common case, which a perfect hash built in
+        Python could not beat.
+        
+        Args:
+            validate_entries (bool): Whether to validate each entry first.
+                                   Stops at the first invalid entry.
             
         Raises:
-            KnowledgeBaseError: If data cannot be loaded
+            KnowledgeBaseError: If an entry is invalid
         """
-        if not self._loaded:
-            self.load_faq_data()
-        return self._faq_data
+        ids = []
+        questions = []
+        answers = []
+        id_index = {}
+        total_question_length = 0
+        total_answer_length = 0
+        
+        for i, entry in enumerate(self._faq_data):
+            if validate_entries:
+                self._validate_entry(i, entry)
+            
+            # Interned IDs are shared by the entries, the ID list and the index
+            entry_id = entry["id"] = sys.intern(entry["id"])
+            question, answer = entry["q"], entry["a"]
+            ids.append(entry_id)
+            questions.append(question)
+            answers.append(answer)
+            id_index.setdefault(entry_id, entry)
+            total_question_length += len(question)
+            total_answer_length += len(answer)
+        
+        self._ids = ids
+        self._questions = tuple(questions)
+        self._answers = answers
+        self._id_index = id_index
+        self._questions_lower = [question.lower() for question in questions]
+        
+        # Inverted index: word token -> increasing entry indices
+        word_index = {}
+        for i, question_lower in enumerate(self._questions_lower):
+            for token in set(_WORD_PATTERN.findall(question_lower)):
+                word_index.setdefault(token, []).append(i)
+        self._word_index = word_index
+        
+        total_entries = len(self._faq_data)
+        self._stats = {
+            "total_entries": total_entries,
+            "avg_question_length": total_question_length / total_entries,
+            "avg_answer_length": total_answer_length / total_entries,
+            "unique_ids": len(id_index),
+            "loaded": True,
+            "file_path": str(self.faq_file_path)
+        }
+    
+    def _mark_loaded(self) -> None:
+        """Publish the loaded data as plain instance attributes"""
+        for name, internal_name in _LAZY_ATTRIBUTES.items():
+            setattr(self, name, getattr(self, internal_name))
+        self._loaded = True
     
-    @property
-    def questions(self) -> List[str]:
+    def __getattr__(self, name: str) -> Any:
         """
-        Get all questions from the FAQ data
+        Load the FAQ data on first access to one of its public attributes
         
-        Returns:
-            List[str]: List of FAQ questions
+        Only called while the attribute is missing, so after loading,
+        faq_data, questions, ids and answers are plain attribute reads.
+        
+        Raises:
+            KnowledgeBaseError: If data cannot be loaded
+            AttributeError: If the attribute does not exist
         """
-        return [entry["q"] for entry in self.faq_data]
+        if name in _LAZY_ATTRIBUTES:
+            self.load_faq_data()
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
     
     def get_entry_by_id(self, entry_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -145,10 +558,9 @@ class KnowledgeBase:
         Returns:
             Optional[Dict[str, Any]]: FAQ entry if found, None otherwise
         """
-        for entry in self.faq_data:
-            if entry["id"] == entry_id:
-                return entry
-        return None
+        if not self._loaded:
+            self.load_faq_data()
+        return self._id_index.get(entry_id)
     
     def get_entry_by_index(self, index: int) -> Optional[Dict[str, Any]]:
         """
@@ -169,39 +581,46 @@ class KnowledgeBase:
         """
         Search for FAQ entries containing a keyword in the question
         
+        A keyword that is a whole word of some question is looked up in the
+        inverted word index, and only matches questions containing that
+        exact word. Any other keyword (partial words, several words,
+        punctuation) falls back to a case-insensitive substring scan of
+        the questions.
+        
         Args:
             keyword (str): Keyword to search for
             
         Returns:
             List[Dict[str, Any]]: List of matching FAQ entries
         """
+        faq_data = self.faq_data
         keyword_lower = keyword.lower()
-        matches = []
         
-        for entry in self.faq_data:
-            if keyword_lower in entry["q"].lower():
-                matches.append(entry)
-                
-        return matches
+        postings = self._word_index.get(keyword_lower)
+        if postings is not None:
+            return [faq_data[i] for i in postings]
+        
+        # Build the match mask in one comprehension, then let compress()
+        # pick the entries without per-entry indexing
+        return list(compress(
+            faq_data,
+            [keyword_lower in question_lower for question_lower in self._questions_lower]
+        ))
     
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the knowledge base
         
+        Statistics are computed once at load time; the returned dictionary
+        is shared and must not be mutated.
+        
         Returns:
             Dict[str, Any]: Dictionary containing knowledge base statistics
         """
         if not self._loaded:
             self.load_faq_data()
             
-        return {
-            "total_entries": len(self._faq_data),
-            "avg_question_length": sum(len(entry["q"]) for entry in self._faq_data) / len(self._faq_data),
-            "avg_answer_length": sum(len(entry["a"]) for entry in self._faq_data) / len(self._faq_data),
-            "unique_ids": len(set(entry["id"] for entry in self._faq_data)),
-            "loaded": self._loaded,
-            "file_path": str(self.faq_file_path)
-        }
+        return self._stats
     
     def reload(self) -> None:
         """
@@ -211,7 +630,19 @@ class KnowledgeBase:
         useful for development or when the file has been updated.
         """
         self._loaded = False
+        for name in _LAZY_ATTRIBUTES:
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
         self._faq_data = []
+        self._ids = []
+        self._answers = []
+        self._id_index = {}
+        self._questions = ()
+        self._questions_lower = []
+        self._word_index = {}
+        self._stats = {}
         self.load_faq_data()
         logger.info("Knowledge base reloaded")
 
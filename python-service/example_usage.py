@@ -5,13 +5,28 @@ Démontre comment utiliser l'API REST pour poser des questions
 """
 
 import requests
+import threading
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 
 # Configuration
 BASE_URL = "http://localhost:8001"
 CHAT_ENDPOINT = f"{BASE_URL}/chat"
 
+# Une session par thread : les connexions HTTP sont réutilisées (keep-alive),
+# et requests ne garantit pas qu'une Session soit thread-safe
+_thread_local = threading.local()
+
+def get_session() -> requests.Session:
+    """Retourne la session HTTP du thread courant"""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"Content-Type": "application/json"})
+        _thread_local.session = session
+    return session
+
 def ask_question(question: str) -> Dict[str, Any]:
     """
     Pose une question au chatbot FAQ Finance
@@ -23,10 +38,9 @@ def ask_question(question: str) -> Dict[str, Any]:
         dict: Réponse du chatbot avec 'answer' et 'sources'
     """
     try:
-        response = requests.post(
+        response = get_session().post(
             CHAT_ENDPOINT,
-            json={"message": question},
-            headers={"Content-Type": "application/json"}
+            json={"message": question}
         )
         response.raise_for_status()
         return response.json()
@@ -41,7 +55,7 @@ def ask_question(question: str) -> Dict[str, Any]:
 def check_service_health() -> bool:
     """Vérifie si le service est disponible"""
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = get_session().get(f"{BASE_URL}/health")
         return response.status_code == 200
     except:
         return False
@@ -151,6 +165,12 @@ def interactive_mode():
         except Exception as e:
             print(f"Erreur inattendue: {e}")
 
+def timed_question(question: str) -> Tuple[Dict[str, Any], float]:
+    """Pose une question et mesure sa latence en secondes"""
+    start_time = time.perf_counter()
+    result = ask_question(question)
+    return result, time.perf_counter() - start_time
+
 def benchmark_performance():
     """Test de performance avec plusieurs requêtes"""
 
@@ -171,20 +191,20 @@ def benchmark_performance():
 
     print(f"Test avec {len(test_questions)} questions...")
 
-    start_time = time.time()
-    successful_requests = 0
+    start_time = time.perf_counter()
 
-    for question in test_questions:
-        result = ask_question(question)
-        if "error" not in result:
-            successful_requests += 1
+    # Requêtes envoyées en parallèle
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        timed_results = list(executor.map(timed_question, test_questions))
+    successful_requests = sum(1 for result, _ in timed_results if "error" not in result)
 
-    end_time = time.time()
-    total_time = end_time - start_time
+    total_time = time.perf_counter() - start_time
+    latencies = [latency for _, latency in timed_results]
 
     print(f"{successful_requests}/{len(test_questions)} requêtes réussies")
     print(f"Temps total: {total_time:.2f}s")
-    print(f"Moyenne: {total_time/len(test_questions):.3f}s par requête")
+    print(f"Débit: {len(test_questions)/total_time:.1f} requêtes/s")
+    print(f"Latence moyenne: {sum(latencies)/len(latencies):.3f}s par requête")
 
 def main():
     """Fonction principale avec menu de choix"""
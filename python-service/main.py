@@ -19,5 +19,7 @@ if __name__ == "__main__":
         app,
         host=settings.host,
         port=settings.port,
+        loop=settings.server_loop,
+        http=settings.server_http,
         reload=settings.debug
     )
\ No newline at end of file
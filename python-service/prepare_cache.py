@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed FAQ index for FAQ Finance Chatbot
+
+Fits the TF-IDF vectorizer on the FAQ questions and saves it, together
+with the normalized FAQ vectors, next to the FAQ data. The service then
+memory-maps this index at startup instead of fitting the vectorizer.
+Run it again whenever the FAQ file changes; stale indexes are ignored.
+
+Usage:
+    python prepare_cache.py
+"""
+
+from app.core.logging import setup_logging
+from app.services.faq_service import faq_service
+
+
+def main():
+    """Fit the vectorizer and write the FAQ index"""
+    setup_logging()
+    faq_service.initialize()
+    index_path = faq_service.save_index()
+    print(f"FAQ index written to {index_path}")
+
+
+if __name__ == "__main__":
+    main()
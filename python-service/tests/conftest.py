@@ -0,0 +1,45 @@
+"""
+Shared pytest fixtures for FAQ Finance Chatbot tests
+"""
+
+import orjson
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_index_cache(tmp_path_factory):
+    """Keep fitted FAQ indexes cached by the tests out of the user's home directory"""
+    from app.core.config import settings
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "faq_index_cache_dir", str(tmp_path_factory.mktemp("index_cache")))
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_snapshots():
+    """Keep pickled FAQ snapshots out of the source tree; snapshot tests opt back in"""
+    from app.core.config import settings
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "faq_snapshot_enabled", False)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_knowledge_base(_no_snapshots):
+    """Load the global knowledge base once per session"""
+    from app.services.knowledge_base import knowledge_base
+
+    knowledge_base.load_faq_data()
+
+
+@pytest.fixture(scope="session")
+def make_faq_file(tmp_path_factory):
+    """Factory writing FAQ data to a faq.json file in a fresh temporary directory"""
+    def _make_faq_file(data):
+        faq_file = tmp_path_factory.mktemp("faq") / "faq.json"
+        faq_file.write_bytes(orjson.dumps(data))
+        return str(faq_file)
+
+    return _make_faq_file
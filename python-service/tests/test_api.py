@@ -1,15 +1,17 @@
+import pytest
 from fastapi.testclient import TestClient
-import sys
-import os
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
 
-client = TestClient(app)
 
-def test_read_root():
+@pytest.fixture(scope="module")
+def client():
+    """Test client running the application lifespan (service initialization)"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_read_root(client):
     """Test the root endpoint"""
     response = client.get("/")
     assert response.status_code == 200
@@ -17,7 +19,7 @@ def test_read_root():
     assert data["service"] == "FAQ Finance Chatbot"
     assert data["status"] == "running"
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
@@ -25,7 +27,7 @@ def test_health_check():
     assert data["status"] == "healthy"
     assert data["faq_entries"] > 0
 
-def test_chat_ebitda():
+def test_chat_ebitda(client):
     """Test chat with EBITDA question"""
     response = client.post(
         "/chat",
@@ -38,7 +40,7 @@ def test_chat_ebitda():
     assert len(data["sources"]) > 0
     assert "EBITDA" in data["answer"] or "ebitda" in data["answer"].lower()
 
-def test_chat_marge_brute():
+def test_chat_marge_brute(client):
     """Test chat with margin question"""
     response = client.post(
         "/chat",
@@ -49,7 +51,7 @@ def test_chat_marge_brute():
     assert "answer" in data
     assert "chiffre d'affaires" in data["answer"].lower() or "marge" in data["answer"].lower()
 
-def test_chat_empty_message():
+def test_chat_empty_message(client):
     """Test chat with empty message"""
     response = client.post(
         "/chat",
@@ -57,7 +59,7 @@ def test_chat_empty_message():
     )
     assert response.status_code == 422  # Pydantic validation error
 
-def test_chat_whitespace_message():
+def test_chat_whitespace_message(client):
     """Test chat with whitespace only message"""
     response = client.post(
         "/chat",
@@ -65,7 +67,7 @@ def test_chat_whitespace_message():
     )
     assert response.status_code == 400
 
-def test_chat_unknown_question():
+def test_chat_unknown_question(client):
     """Test chat with question completely unrelated to finance"""
     response = client.post(
         "/chat",
@@ -80,7 +82,7 @@ def test_chat_unknown_question():
         assert "désolé" in data["answer"].lower() or "n'ai pas trouvé" in data["answer"].lower()
     # If it does match something (due to low threshold), that's acceptable too
 
-def test_chat_cash_flow():
+def test_chat_cash_flow(client):
     """Test chat with cash flow question"""
     response = client.post(
         "/chat",
@@ -93,7 +95,7 @@ def test_chat_cash_flow():
     assert len(data["sources"]) > 0
     assert "cash" in data["answer"].lower() or "trésorerie" in data["answer"].lower()
 
-def test_chat_roe():
+def test_chat_roe(client):
     """Test chat with ROE question"""
     response = client.post(
         "/chat",
@@ -104,7 +106,7 @@ def test_chat_roe():
     assert "answer" in data
     assert "ROE" in data["answer"] or "Return on Equity" in data["answer"]
 
-def test_chat_capex():
+def test_chat_capex(client):
     """Test chat with CAPEX question"""
     response = client.post(
         "/chat",
@@ -115,7 +117,7 @@ def test_chat_capex():
     assert "answer" in data
     assert "CAPEX" in data["answer"] or "Capital Expenditure" in data["answer"]
 
-def test_chat_case_insensitive():
+def test_chat_case_insensitive(client):
     """Test that matching is case insensitive"""
     response = client.post(
         "/chat",
@@ -127,7 +129,7 @@ def test_chat_case_insensitive():
     assert len(data["sources"]) > 0
     assert "faq#ebitda" in data["sources"]
 
-def test_chat_partial_match():
+def test_chat_partial_match(client):
     """Test partial matching with keywords"""
     response = client.post(
         "/chat",
@@ -139,7 +141,7 @@ def test_chat_partial_match():
     # Should match "dette nette" question
     assert "dette" in data["answer"].lower()
 
-def test_invalid_json():
+def test_invalid_json(client):
     """Test with invalid JSON structure"""
     response = client.post(
         "/chat",
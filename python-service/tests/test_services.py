@@ -5,27 +5,23 @@ This module contains unit tests for the core business logic services
 including FAQ matching and knowledge base management.
 """
 
+import asyncio
+import pickle
+import time
 import pytest
-import tempfile
-import json
-import os
-from unittest.mock import patch, MagicMock
+import numpy as np
+import orjson
+from unittest.mock import patch
 
-from app.services.knowledge_base import KnowledgeBase, KnowledgeBaseError
+from app.services.knowledge_base import KnowledgeBase, KnowledgeBaseError, SNAPSHOT_FORMAT_VERSION
 from app.services.faq_service import FAQService, FAQServiceError
+from app.services.batching import BatchingFAQService
 from app.core.config import settings
 
 
 class TestKnowledgeBase:
     """Test cases for KnowledgeBase class"""
 
-    def create_temp_faq_file(self, data):
-        """Helper to create temporary FAQ file"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        json.dump(data, temp_file, ensure_ascii=False, indent=2)
-        temp_file.close()
-        return temp_file.name
-
     def test_load_valid_faq_data(self):
         """Test loading valid FAQ data"""
         test_data = [
@@ -33,17 +29,13 @@ class TestKnowledgeBase:
             {"id": "test2", "q": "Another question?", "a": "Another answer."}
         ]
 
-        temp_file = self.create_temp_faq_file(test_data)
-
-        try:
-            kb = KnowledgeBase(temp_file)
-            kb.load_faq_data()
+        kb = KnowledgeBase.from_data(test_data)
 
-            assert kb.faq_data == test_data
-            assert len(kb.questions) == 2
-            assert kb.questions[0] == "Test question?"
-        finally:
-            os.unlink(temp_file)
+        assert kb.faq_data == test_data
+        assert len(kb.questions) == 2
+        assert kb.questions[0] == "Test question?"
+        assert kb.ids == ["test1", "test2"]
+        assert kb.answers == ["Test answer.", "Another answer."]
 
     def test_load_missing_file(self):
         """Test loading from non-existent file"""
@@ -52,46 +44,47 @@ class TestKnowledgeBase:
         with pytest.raises(KnowledgeBaseError, match="FAQ file not found"):
             kb.load_faq_data()
 
-    def test_load_invalid_json(self):
+    def test_load_invalid_json(self, tmp_path):
         """Test loading invalid JSON file"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        temp_file.write("invalid json content")
-        temp_file.close()
-
-        try:
-            kb = KnowledgeBase(temp_file.name)
-            with pytest.raises(KnowledgeBaseError, match="Invalid JSON"):
-                kb.load_faq_data()
-        finally:
-            os.unlink(temp_file.name)
-
-    def test_validate_missing_fields(self):
+        faq_file = tmp_path / "faq.json"
+        faq_file.write_text("invalid json content")
+
+        kb = KnowledgeBase(str(faq_file))
+        with pytest.raises(KnowledgeBaseError, match="Invalid JSON"):
+            kb.load_faq_data()
+
+    def test_validate_missing_fields(self, make_faq_file):
         """Test validation of FAQ entries with missing fields"""
         invalid_data = [
             {"id": "test1", "q": "Test question?"},  # Missing 'a' field
         ]
 
-        temp_file = self.create_temp_faq_file(invalid_data)
+        temp_file = make_faq_file(invalid_data)
 
-        try:
-            kb = KnowledgeBase(temp_file)
-            with pytest.raises(KnowledgeBaseError, match="missing required fields"):
-                kb.load_faq_data()
-        finally:
-            os.unlink(temp_file)
+        kb = KnowledgeBase(temp_file)
+        with pytest.raises(KnowledgeBaseError, match="missing required fields"):
+            kb.load_faq_data()
 
-    def test_validate_empty_data(self):
+    def test_validate_reports_first_invalid_entry(self):
+        """Test validation stops at the first invalid entry"""
+        invalid_data = [
+            {"id": "test1", "q": "Valid question?", "a": "Valid answer."},
+            {"id": "test2", "q": "   ", "a": "Blank question."},
+            {"id": "test3", "q": "Missing answer?"}
+        ]
+
+        with pytest.raises(KnowledgeBaseError, match="FAQ entry 1 has invalid 'q' field"):
+            KnowledgeBase.from_data(invalid_data)
+
+    def test_validate_empty_data(self, make_faq_file):
         """Test validation of empty FAQ data"""
         empty_data = []
 
-        temp_file = self.create_temp_faq_file(empty_data)
+        temp_file = make_faq_file(empty_data)
 
-        try:
-            kb = KnowledgeBase(temp_file)
-            with pytest.raises(KnowledgeBaseError, match="FAQ data cannot be empty"):
-                kb.load_faq_data()
-        finally:
-            os.unlink(temp_file)
+        kb = KnowledgeBase(temp_file)
+        with pytest.raises(KnowledgeBaseError, match="FAQ data cannot be empty"):
+            kb.load_faq_data()
 
     def test_get_entry_by_id(self):
         """Test retrieving FAQ entry by ID"""
@@ -100,20 +93,26 @@ class TestKnowledgeBase:
             {"id": "test2", "q": "Another question?", "a": "Another answer."}
         ]
 
-        temp_file = self.create_temp_faq_file(test_data)
+        kb = KnowledgeBase.from_data(test_data)
 
-        try:
-            kb = KnowledgeBase(temp_file)
-            kb.load_faq_data()
+        entry = kb.get_entry_by_id("test1")
+        assert entry is not None
+        assert entry["q"] == "Test question?"
+
+        not_found = kb.get_entry_by_id("nonexistent")
+        assert not_found is None
+
+    def test_get_entry_by_id_duplicate_ids(self):
+        """Test that the first entry wins when IDs are duplicated"""
+        test_data = [
+            {"id": "dup", "q": "First question?", "a": "First answer."},
+            {"id": "dup", "q": "Second question?", "a": "Second answer."}
+        ]
 
-            entry = kb.get_entry_by_id("test1")
-            assert entry is not None
-            assert entry["q"] == "Test question?"
+        kb = KnowledgeBase.from_data(test_data)
 
-            not_found = kb.get_entry_by_id("nonexistent")
-            assert not_found is None
-        finally:
-            os.unlink(temp_file)
+        assert kb.get_entry_by_id("dup") is kb.faq_data[0]
+        assert kb.get_stats()["unique_ids"] == 1
 
     def test_search_questions(self):
         """Test searching questions by keyword"""
@@ -123,20 +122,45 @@ class TestKnowledgeBase:
             {"id": "test3", "q": "What is cash flow?", "a": "Cash flow definition."}
         ]
 
-        temp_file = self.create_temp_faq_file(test_data)
+        kb = KnowledgeBase.from_data(test_data)
 
-        try:
-            kb = KnowledgeBase(temp_file)
-            kb.load_faq_data()
+        results = kb.search_questions("EBITDA")
+        assert len(results) == 1
+        assert results[0]["id"] == "test1"
+
+        results = kb.search_questions("what")
+        assert len(results) == 2  # "What is EBITDA?" and "What is cash flow?"
+
+        # Partial words and multi-word keywords keep substring semantics
+        assert [r["id"] for r in kb.search_questions("calc")] == ["test2"]
+        assert [r["id"] for r in kb.search_questions("is cash")] == ["test3"]
+
+    def test_search_questions_whole_word_lookup(self):
+        """Test that known words match exactly and other keywords by substring"""
+        test_data = [
+            {"id": "test1", "q": "What is cash flow?", "a": "Cash flow definition."},
+            {"id": "test2", "q": "Cashflow forecast?", "a": "Forecast explanation."}
+        ]
+
+        kb = KnowledgeBase.from_data(test_data)
+
+        assert [r["id"] for r in kb.search_questions("Cash")] == ["test1"]
+        assert [r["id"] for r in kb.search_questions("cashf")] == ["test2"]
+        assert [r["id"] for r in kb.search_questions("ash")] == ["test1", "test2"]
 
-            results = kb.search_questions("EBITDA")
-            assert len(results) == 1
-            assert results[0]["id"] == "test1"
+    def test_search_questions_non_ascii_fallback(self):
+        """Test the substring fallback on accented, multi-word keywords"""
+        test_data = [
+            {"id": "fr1", "q": "Qu'est-ce que l'EBITDA ?", "a": "Définition."},
+            {"id": "fr2", "q": "Comment ÉVALUER une entreprise ?", "a": "Évaluation."},
+            {"id": "fr3", "q": "Comment évaluer un actif ?", "a": "Évaluation d'actif."}
+        ]
 
-            results = kb.search_questions("what")
-            assert len(results) == 2  # "What is EBITDA?" and "What is cash flow?"
-        finally:
-            os.unlink(temp_file)
+        kb = KnowledgeBase.from_data(test_data)
+
+        assert [r["id"] for r in kb.search_questions("ÉVALUER UN")] == ["fr2", "fr3"]
+        assert [r["id"] for r in kb.search_questions("l'ebitda")] == ["fr1"]
+        assert kb.search_questions("évaluer des") == []
 
     def test_get_stats(self):
         """Test knowledge base statistics"""
@@ -145,45 +169,132 @@ class TestKnowledgeBase:
             {"id": "test2", "q": "Longer question here?", "a": "Much longer answer with more details."}
         ]
 
-        temp_file = self.create_temp_faq_file(test_data)
+        kb = KnowledgeBase.from_data(test_data)
+
+        stats = kb.get_stats()
+        assert stats["total_entries"] == 2
+        assert stats["loaded"] == True
+        assert stats["unique_ids"] == 2
+        assert "avg_question_length" in stats
+        assert "avg_answer_length" in stats
+
+    def test_snapshot_reused_until_file_changes(self, tmp_path, monkeypatch):
+        """Test that the parsed snapshot is reused only while the JSON file is unchanged"""
+        monkeypatch.setattr(settings, "faq_snapshot_enabled", True)
+        faq_file = tmp_path / "faq.json"
+        faq_file.write_bytes(orjson.dumps([{"id": "test1", "q": "Test question?", "a": "Test answer."}]))
+
+        KnowledgeBase(str(faq_file)).load_faq_data()
+        assert (tmp_path / "faq.pkl").exists()
+
+        with patch("app.services.knowledge_base.orjson.loads") as mock_loads:
+            kb = KnowledgeBase(str(faq_file))
+            kb.load_faq_data()
+            mock_loads.assert_not_called()
+        assert kb.get_entry_by_id("test1") is kb.faq_data[0]
+
+        faq_file.write_bytes(orjson.dumps([{"id": "test2", "q": "New question?", "a": "New answer."}]))
+        kb = KnowledgeBase(str(faq_file))
+        kb.load_faq_data()
+        assert kb.ids == ["test2"]
+
+    @pytest.mark.parametrize("foreign_snapshot", [False, True])
+    def test_malformed_snapshot_falls_back_to_json(self, tmp_path, monkeypatch, foreign_snapshot):
+        """Test that a snapshot of the wrong shape is ignored and the JSON is parsed"""
+        monkeypatch.setattr(settings, "faq_snapshot_enabled", True)
+        faq_file = tmp_path / "faq.json"
+        faq_file.write_bytes(orjson.dumps([{"id": "test1", "q": "Test question?", "a": "Test answer."}]))
+        source_stat = faq_file.stat()
+        if foreign_snapshot:
+            # Matches the JSON file but misses the loaded state
+            snapshot = {
+                "format": SNAPSHOT_FORMAT_VERSION,
+                "mtime_ns": source_stat.st_mtime_ns,
+                "size": source_stat.st_size
+            }
+        else:
+            snapshot = ["not", "a", "dict"]
+        (tmp_path / "faq.pkl").write_bytes(pickle.dumps(snapshot))
+
+        kb = KnowledgeBase(str(faq_file))
+        kb.load_faq_data()
+        assert kb.ids == ["test1"]
+
+    def test_stream_large_faq_file(self, tmp_path, monkeypatch):
+        """Test that large FAQ files are stream-decoded and validated per entry"""
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(settings, "faq_stream_min_bytes", 0)
+
+        faq_file = tmp_path / "faq.json"
+        test_data = [
+            {"id": "test1", "q": "Test question?", "a": "Test answer."},
+            {"id": "test2", "q": "Another question?", "a": "Another answer."}
+        ]
+        faq_file.write_bytes(orjson.dumps(test_data))
+
+        kb = KnowledgeBase(str(faq_file))
+        kb.load_faq_data()
+        assert kb.faq_data == test_data
+
+        faq_file.write_bytes(orjson.dumps(test_data + [{"id": "test3", "q": "Missing answer?"}]))
+        with pytest.raises(KnowledgeBaseError, match="missing required fields"):
+            KnowledgeBase(str(faq_file)).load_faq_data()
+
+    def test_stream_rejects_non_list_faq_file(self, tmp_path, monkeypatch):
+        """Test that stream-decoding a top-level object fails like the in-memory path"""
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(settings, "faq_stream_min_bytes", 0)
 
-        try:
-            kb = KnowledgeBase(temp_file)
+        faq_file = tmp_path / "faq.json"
+        faq_file.write_bytes(orjson.dumps({"item": [{"id": "test1", "q": "Test question?", "a": "Test answer."}]}))
+
+        kb = KnowledgeBase(str(faq_file))
+        with pytest.raises(KnowledgeBaseError, match="must be a list"):
             kb.load_faq_data()
+    def test_async_load_faq_data(self, tmp_path):
+        """Test that the async loader matches the synchronous one"""
+        faq_file = tmp_path / "faq.json"
+        test_data = [{"id": "test1", "q": "Test question?", "a": "Test answer."}]
+        faq_file.write_bytes(orjson.dumps(test_data))
+
+        kb = KnowledgeBase(str(faq_file))
+        asyncio.run(kb.aload_faq_data())
+        assert kb.faq_data == test_data
+        assert kb.get_entry_by_id("test1") is kb.faq_data[0]
 
-            stats = kb.get_stats()
-            assert stats["total_entries"] == 2
-            assert stats["loaded"] == True
-            assert stats["unique_ids"] == 2
-            assert "avg_question_length" in stats
-            assert "avg_answer_length" in stats
-        finally:
-            os.unlink(temp_file)
+        with pytest.raises(KnowledgeBaseError, match="FAQ file not found"):
+            asyncio.run(KnowledgeBase(str(tmp_path / "missing.json")).aload_faq_data())
 
 
 class TestFAQService:
     """Test cases for FAQService class"""
 
-    @pytest.fixture
-    def sample_kb(self):
-        """Create a sample knowledge base for testing"""
-        test
-_data = [
+    @pytest.fixture(scope="module")
+    def sample_kb(self, make_faq_file):
+        """Create a sample knowledge base shared by the FAQ service tests (read-only)"""
+        test_data = [
             {"id": "faq1", "q": "What is EBITDA?", "a": "EBITDA is a financial metric."},
             {"id": "faq2", "q": "How to calculate ROE?", "a": "ROE is calculated by dividing net income by equity."},
             {"id": "faq3", "q": "What is cash flow?", "a": "Cash flow is the movement of money."}
         ]
 
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        json.dump(test_data, temp_file, ensure_ascii=False, indent=2)
-        temp_file.close()
-
-        kb = KnowledgeBase(temp_file.name)
+        kb = KnowledgeBase(make_faq_file(test_data))
         kb.load_faq_data()
 
-        yield kb
+        return kb
+
+    @pytest.fixture(scope="module")
+    def _shared_service(self, sample_kb):
+        """Initialize one FAQ service over the sample knowledge base"""
+        service = FAQService(kb=sample_kb)
+        service.initialize()
+        return service
 
-        os.unlink(temp_file.name)
+    @pytest.fixture
+    def initialized_service(self, _shared_service):
+        """Shared initialized FAQ service, reset to the default threshold with empty caches"""
+        _shared_service.update_threshold(settings.similarity_threshold)
+        return _shared_service
 
     def test_service_initialization(self, sample_kb):
         """Test FAQ service initialization"""
@@ -195,39 +306,52 @@ _data = [
         assert service._vectorizer is not None
         assert service._faq_vectors is not None
 
-    def test_find_exact_match(self, sample_kb):
+    def test_find_exact_match(self, initialized_service):
         """Test finding exact matches"""
-        service = FAQService(kb=sample_kb, threshold=0.1)
-        service.initialize()
+        service = initialized_service
+        service.update_threshold(0.1)
 
         result = service.find_best_match("What is EBITDA?")
         assert result is not None
-        assert result["id"] == "faq1"
-        assert "_similarity_score" in result
-        assert result["_similarity_score"] > 0.9  # Should be very high for exact match
+        entry_id, answer, score = result
+        assert entry_id == "faq1"
+        assert answer == "EBITDA is a financial metric."
+        assert score > 0.9  # Should be very high for exact match
 
-    def test_find_partial_match(self, sample_kb):
+    def test_find_partial_match(self, initialized_service):
         """Test finding partial matches"""
-        service = FAQService(kb=sample_kb, threshold=0.1)
-        service.initialize()
+        service = initialized_service
+        service.update_threshold(0.1)
 
         result = service.find_best_match("EBITDA definition")
         assert result is not None
-        assert result["id"] == "faq1"
-        assert result["_similarity_score"] > 0.1
+        entry_id, answer, score = result
+        assert entry_id == "faq1"
+        assert score > 0.1
 
-    def test_no_match_below_threshold(self, sample_kb):
+    def test_no_match_below_threshold(self, initialized_service):
         """Test when no match exceeds threshold"""
-        service = FAQService(kb=sample_kb, threshold=0.9)  # Very high threshold
-        service.initialize()
+        service = initialized_service
+        service.update_threshold(0.9)  # Very high threshold
 
         result = service.find_best_match("How to cook pasta?")
         assert result is None
 
-    def test_process_query_with_match(self, sample_kb):
+    def test_threshold_is_exclusive(self, initialized_service):
+        """Test that a best score equal to the threshold is rejected"""
+        service = initialized_service
+        _, best_score = service._find_best("cash flow definition")
+
+        service.update_threshold(best_score)
+        assert service.find_best_match("cash flow definition") is None
+
+        service.update_threshold(np.nextafter(best_score, 0.0))
+        assert service.find_best_match("cash flow definition")[0] == "faq3"
+
+    def test_process_query_with_match(self, initialized_service):
         """Test processing query that finds a match"""
-        service = FAQService(kb=sample_kb, threshold=0.1)
-        service.initialize()
+        service = initialized_service
+        service.update_threshold(0.1)
 
         result = service.process_query("What is EBITDA?")
         assert result["matched"] == True
@@ -235,10 +359,10 @@ _data = [
         assert result["sources"] == ["faq1"]
         assert result["similarity_score"] > 0.9
 
-    def test_process_query_no_match(self, sample_kb):
+    def test_process_query_no_match(self, initialized_service):
         """Test processing query that finds no match"""
-        service = FAQService(kb=sample_kb, threshold=0.9)  # Very high threshold
-        service.initialize()
+        service = initialized_service
+        service.update_threshold(0.9)  # Very high threshold
 
         result = service.process_query("How to cook pasta?")
         assert result["matched"] == False
@@ -246,18 +370,279 @@ _data = [
         assert result["sources"] == []
         assert result["similarity_score"] == 0.0
 
-    def test_get_multiple_matches(self, sample_kb):
-        """Test getting multiple matches"""
-        service = FAQService(kb=sample_kb, threshold=0.01)
+    def test_process_query_cache(self, initialized_service):
+        """Test that repeated queries are served from the cache"""
+        service = initialized_service
+        service.update_threshold(0.1)
+
+        first = service.process_query("What is EBITDA?")
+        second = service.process_query("  what is ebitda?  ")
+        assert second is first
+        assert service._cached_process_query.cache_info().hits == 1
+
+        service.update_threshold(0.9)
+        assert service._cached_process_query.cache_info().currsize == 0
+        assert service.process_query("What is EBITDA?")["matched"] == True
+
+    def test_query_vector_cache(self, sample_kb):
+        """Test that repeated queries reuse their cached TF-IDF vector"""
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+
+        first = service.find_best_match("What is EBITDA?")
+        assert service.find_best_match("What is EBITDA?") == first
+        service.get_multiple_matches("What is EBITDA?")
+        assert service._cached_vectorize_query.cache_info().hits == 2
+
         service.initialize()
+        assert service._cached_vectorize_query.cache_info().currsize == 0
+
+    def test_dense_and_sparse_scores_agree(self, sample_kb):
+        """Test that dense scoring matches the sparse fallback"""
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+        assert service._faq_dense is not None
+
+        dense_scores = service._compute_similarities("what is ebitda and roe?")
+        service._faq_dense = None
+        sparse_scores = service._compute_similarities("what is ebitda and roe?")
+
+        assert np.allclose(dense_scores, sparse_scores, atol=1e-6)
+
+    def test_best_match_kernel_agrees_with_argmax(self, initialized_service):
+        """Test that the compiled best-match kernel picks the argmax entry"""
+        service = initialized_service
+        service.update_threshold(0.1)
+
+        similarities = service._compute_similarities("what is ebitda and roe?")
+        best_idx, best_score = service._find_best("what is ebitda and roe?")
+
+        assert best_idx == int(np.argmax(similarities))
+        assert best_score == pytest.approx(float(similarities[best_idx]), abs=1e-6)
+
+        # Ties, including an all-zero query, go to the first row
+        from app.services import _kernels
+        zero_idx, zero_score = _kernels.best_match(
+            np.ones((3, 4), dtype=np.float32), np.zeros(4, dtype=np.float32)
+        )
+        assert (zero_idx, zero_score) == (0, 0.0)
+
+    def test_large_sparse_faq_stays_sparse(self, sample_kb, monkeypatch):
+        """Test that the dense matrix is skipped for large, sparse knowledge bases"""
+        monkeypatch.setattr(settings, "dense_vectors_max_rows", 1)
+        monkeypatch.setattr(settings, "dense_vectors_min_density", 1.0)
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+
+        assert service._faq_dense is None
+        assert service.find_best_match("What is EBITDA?")[0] == "faq1"
+
+    def test_int8_dense_vectors(self, sample_kb, monkeypatch):
+        """Test that int8-quantized scoring stays close to float32 scoring"""
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+        float_scores = service._compute_similarities("what is ebitda and roe?")
+
+        monkeypatch.setattr(settings, "dense_vectors_dtype", "int8")
+        service.initialize()
+        assert service._faq_dense.dtype == np.int8
+
+        # Every FAQ row gets its own scale, so its largest weight maps to 127
+        assert service._dense_row_scales.shape == (3,)
+        assert np.abs(service._faq_dense).max(axis=1).tolist() == [127, 127, 127]
+
+        int8_scores = service._compute_similarities("what is ebitda and roe?")
+        assert int8_scores.dtype == np.float32
+        assert np.allclose(int8_scores, float_scores, atol=0.02)
+        assert service.find_best_match("What is EBITDA?")[0] == "faq1"
+
+    def test_dot_scores_fallback_agrees(self, monkeypatch):
+        """Test that the SimSIMD and NumPy compact dot products agree"""
+        from app.services import _kernels
+
+        rng = np.random.default_rng(0)
+        queries = rng.random((2, 16), dtype=np.float32)
+        faq = rng.random((3, 16), dtype=np.float32).astype(np.float16)
+
+        scores = _kernels.dot_scores(queries, faq)
+        monkeypatch.setattr(_kernels, "SIMSIMD_AVAILABLE", False)
+        fallback_scores = _kernels.dot_scores(queries, faq)
+
+        assert scores.dtype == fallback_scores.dtype == np.float32
+        assert np.allclose(scores, fallback_scores, atol=1e-2)
 
-        matches = service.get_multiple_matches("financial metric", top_k=3)
+    def test_top_k_kernel_agrees_with_numpy(self):
+        """Test that the compiled top-k selection matches the NumPy fallback"""
+        from app.services import _kernels
+
+        rng = np.random.default_rng(0)
+        scores = rng.random(50, dtype=np.float32)
+        scores[[3, 7, 11]] = 0.99  # ties keep index order
+
+        for k in (0, 1, 3, 60):
+            indices, top_scores = _kernels.top_k(scores, k, 0.5)
+            expected_indices, expected_scores = _kernels._top_k_numpy(scores, k, 0.5)
+            assert list(indices) == list(expected_indices)
+            assert np.array_equal(top_scores, expected_scores)
+
+    def test_char_ngram_analyzer(self, sample_kb, monkeypatch):
+        """Test matching with the character n-gram analyzer"""
+        monkeypatch.setattr(settings, "vectorizer_analyzer", "char_wb")
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+
+        assert service._faq_vectors.dtype == np.float32
+        assert service.find_best_match("What is EBITDA?")[0] == "faq1"
+
+    def test_precomputed_index(self, sample_kb, tmp_path):
+        """Test saving and reusing the precomputed FAQ index"""
+        index_file = tmp_path / "faq_index.joblib"
+        service = FAQService(kb=sample_kb, threshold=0.1, index_file_path=str(index_file))
+        service.initialize()
+        service.save_index()
+
+        loaded = FAQService(kb=sample_kb, threshold=0.1, index_file_path=str(index_file))
+        assert loaded._load_index(index_file, sample_kb.questions) is not None
+        loaded.initialize()
+        assert loaded.find_best_match("What is EBITDA?")[0] == "faq1"
+
+        # An index built from other questions is ignored
+        assert loaded._load_index(index_file, ["Unrelated question?"]) is None
+
+    def test_index_cache(self, sample_kb, tmp_path, monkeypatch):
+        """Test that a fitted index is cached by content and reused"""
+        monkeypatch.setattr(settings, "faq_index_cache_dir", str(tmp_path))
+        service = FAQService(kb=sample_kb, threshold=0.1, index_file_path=str(tmp_path / "none.joblib"))
+        service.initialize()
+        assert len(list(tmp_path.glob("faq_index-*.npz"))) == 1
+
+        cached = FAQService(kb=sample_kb, threshold=0.1, index_file_path=str(tmp_path / "none.joblib"))
+        with patch.object(FAQService, "_fit_vectors") as mock_fit:
+            cached.initialize()
+            mock_fit.assert_not_called()
+        assert cached.find_best_match("What is EBITDA?")[0] == "faq1"
+        assert np.array_equal(
+            cached._compute_similarities("what is ebitda and roe?"),
+            service._compute_similarities("what is ebitda and roe?")
+        )
+
+        # Other questions get their own cache entry
+        other_key = FAQService._index_cache_path(["Unrelated question?"])
+        assert other_key != FAQService._index_cache_path(sample_kb.questions)
+
+    def test_float16_dense_vectors(self, sample_kb, monkeypatch):
+        """Test that float16 storage stays close to float32 scoring"""
+        service = FAQService(kb=sample_kb, threshold=0.1)
+        service.initialize()
+        float_scores = service._compute_similarities("what is ebitda and roe?")
+
+        monkeypatch.setattr(settings, "dense_vectors_dtype", "float16")
+        service.initialize()
+        assert service._faq_dense.dtype == np.float16
+
+        half_scores = service._compute_similarities("what is ebitda and roe?")
+        assert half_scores.dtype == np.float32
+        assert np.allclose(half_scores, float_scores, atol=1e-3)
+
+    def test_process_queries_matches_process_query(self, initialized_service):
+        """Test that batch processing returns the same answers as single queries"""
+        service = initialized_service
+        service.update_threshold(0.1)
+
+        queries = ["What is EBITDA?", "How to calculate ROE?", "Random unrelated query"]
+        results = service.process_queries(queries)
+
+        assert [r["sources"] for r in results] == [["faq1"], ["faq2"], []]
+        assert results == [service.process_query(q) for q in queries]
+        assert service.process_queries([]) == []
+
+    def test_batching_service(self, initialized_service):
+        """Test that concurrent queries are batched and answered individually"""
+        service = initialized_service
+        service.update_threshold(0.1)
+        batching = BatchingFAQService(service, max_batch_size=2, max_wait_ms=1.0)
+
+        async def ask_all():
+            queries = ["What is EBITDA?", "What is cash flow?", "How to calculate ROE?"]
+            return await asyncio.gather(*(batching.aprocess_query(q) for q in queries))
+
+        results = asyncio.run(ask_all())
+        assert [r["sources"] for r in results] == [["faq1"], ["faq3"], ["faq2"]]
+
+    def test_batching_survives_cancelled_leader(self, initialized_service, monkeypatch):
+        """Test that cancelling the first query of a batch does not stall later queries"""
+        service = initialized_service
+        service.update_threshold(0.1)
+        process_query = service.process_query
+
+        def slow_process_query(query):
+            time.sleep(0.05)
+            return process_query(query)
+
+        # Keep a worker call busy so the next queries are batched
+        monkeypatch.setattr(service, "process_query", slow_process_query)
+        batching = BatchingFAQService(service, max_batch_size=32, max_wait_ms=1000.0)
+
+        async def cancel_leader_then_ask():
+            busy = asyncio.create_task(batching.aprocess_query("What is EBITDA?"))
+            await asyncio.sleep(0.005)
+            leader = asyncio.create_task(batching.aprocess_query("What is cash flow?"))
+            await asyncio.sleep(0.001)
+            assert batching._pending is not None
+            leader.cancel()
+            follower = await asyncio.wait_for(batching.aprocess_query("How to calculate ROE?"), timeout=0.5)
+            return await busy, leader, follower
+
+        busy, leader, follower = asyncio.run(cancel_leader_then_ask())
+        assert busy["sources"] == ["faq1"]
+        assert leader.cancelled()
+        assert follower["sources"] == ["faq2"]
+        assert batching._pending is None
+
+    def test_batching_idle_query_does_not_wait(self, initialized_service):
+        """Test that a query on an idle service is answered without a batching delay"""
+        service = initialized_service
+        service.update_threshold(0.1)
+        batching = BatchingFAQService(service, max_wait_ms=1000.0)
+
+        start = time.perf_counter()
+        result = asyncio.run(batching.aprocess_query("What is EBITDA?"))
+        assert time.perf_counter() - start < 0.5
+        assert result["sources"] == ["faq1"]
+
+        # Cached queries are answered from the query cache
+        assert asyncio.run(batching.aprocess_query("  what is ebitda?")) is result
+
+    def test_process_queries_uses_query_cache(self, initialized_service):
+        """Test that batches only score distinct queries missing from the cache"""
+        service = initialized_service
+        service.update_threshold(0.1)
+        cached = service.process_query("What is EBITDA?")
+
+        with patch.object(
+            service, "_compute_similarity_matrix", wraps=service._compute_similarity_matrix
+        ) as mock_scores:
+            results = service.process_queries(["what is ebitda?", "What is cash flow?", "what is cash flow?"])
+
+        mock_scores.assert_called_once_with(["what is cash flow?"])
+        assert results[0] is cached
+        assert results[1] is results[2]
+        assert service.process_query("What is cash flow?") is results[1]
+
+    def test_get_multiple_matches(self, initialized_service):
+        """Test getting multiple matches"""
+        service = initialized_service
+        service.update_threshold(0.01)
+
+        # The query must share a term with a sample question to match at all
+        matches = service.get_multiple_matches("EBITDA metric", top_k=3)
         assert isinstance(matches, list)
         assert len(matches) >= 1  # Should find at least EBITDA
+        assert matches[0][0]["id"] == "faq1"
 
-        for match in matches:
-            assert "_similarity_score" in match
-            assert match["_similarity_score"] > 0.01
+        for entry, score in matches:
+            assert "id" in entry
+            assert score > 0.01
 
     def test_update_threshold(self, sample_kb):
         """Test updating similarity threshold"""
@@ -280,22 +665,19 @@ _data = [
             service.find_best_match("test query")
 
         with pytest.raises(FAQServiceError, match="not initialized"):
-            service.get
-_multiple_matches("test query")
+            service.get_multiple_matches("test query")
     
-    def test_empty_query_handling(self, sample_kb):
+    def test_empty_query_handling(self, initialized_service):
         """Test handling of empty queries"""
-        service = FAQService(kb=sample_kb)
-        service.initialize()
+        service = initialized_service
         
         assert service.find_best_match("") is None
         assert service.find_best_match("   ") is None
         assert service.get_multiple_matches("") == []
     
-    def test_get_service_stats(self, sample_kb):
+    def test_get_service_stats(self, initialized_service):
         """Test getting service statistics"""
-        service = FAQService(kb=sample_kb)
-        service.initialize()
+        service = initialized_service
         
         stats = service.get_service_stats()
         assert stats["initialized"] == True
@@ -304,11 +686,22 @@ _multiple_matches("test query")
         assert stats["total_entries"] == 3
         assert "faq_vectors_shape" in stats
 
+    def test_vectorizer_builds_no_vocabulary(self, initialized_service):
+        """Test the hashing vectorizer only fits IDF weights"""
+        service = initialized_service
+        
+        hashing, tfidf = service._vectorizer[0], service._vectorizer[-1]
+        assert not hasattr(hashing, "vocabulary_")
+        assert tfidf.idf_.shape == (hashing.n_features,)
+        
+        # IDF is only kept for buckets used by an FAQ question
+        assert np.count_nonzero(tfidf.idf_) == service._get_vocab_size()
+
 
 class TestServiceIntegration:
     """Integration tests for services working together"""
     
-    def test_end_to_end_query_processing(self):
+    def test_end_to_end_query_processing(self, make_faq_file):
         """Test complete query processing flow"""
         # This would use the actual FAQ data if available
         with patch('app.services.knowledge_base.settings') as mock_settings:
@@ -317,26 +710,20 @@ class TestServiceIntegration:
                 {"id": "integration1", "q": "What is working capital?", "a": "Working capital is current assets minus current liabilities."}
             ]
             
-            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-            json.dump(test_data, temp_file, ensure_ascii=False, indent=2)
-            temp_file.close()
+            mock_settings.faq_file_path = make_faq_file(test_data)
+            mock_settings.faq_snapshot_enabled = False
+            mock_settings.faq_stream_min_bytes = settings.faq_stream_min_bytes
+            
+            kb = KnowledgeBase()
+            service = FAQService(kb=kb)
+            service.initialize()
             
-            mock_settings.faq_file_path = temp_file.name
+            # Test successful query
+            result = service.process_query("working capital definition")
+            assert result["matched"] == True
+            assert "working capital" in result["answer"].lower()
             
-            try:
-                kb = KnowledgeBase()
-                service = FAQService(kb=kb)
-                service.initialize()
-                
-                # Test successful query
-                result = service.process_query("working capital definition")
-                assert result["matched"] == True
-                assert "working capital" in result["answer"].lower()
-                
-                # Test unsuccessful query
-                result = service.process_query("random unrelated query")
-                assert result["matched"] == False
-                assert result["sources"] == []
-                
-            finally:
-                os.unlink(temp_file.name)
\ No newline at end of file
+            # Test unsuccessful query
+            result = service.process_query("random unrelated query")
+            assert result["matched"] == False
+            assert result["sources"] == []
\ No newline at end of file